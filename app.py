@@ -1,7 +1,12 @@
 # app.py - Simple Cloud Run compatible API
-from flask import Flask, request, jsonify
+import time
+_BOOT_START = time.perf_counter()
+
+import importlib
 import os
 import sys
+from datetime import date
+from flask import Flask, request, jsonify, Response
 from dotenv import load_dotenv
 
 # Add src to Python path
@@ -10,8 +15,38 @@ sys.path.append('/app/src')
 # Load environment variables
 load_dotenv()
 
+from src.metrics import (render_prometheus, start_request_timings, pop_request_timings, stage_timer,
+                         HTTP_REQUESTS, COLD_START_MS)
+
+# Pipeline modules are imported once per worker (before fork when gunicorn
+# runs with preload_app), never inside request handlers. Only the serving
+# path is imported here: src.evaluate / notebooks pull in pandas and friends.
+SERVING_MODULES = ['src.gemini_client', 'src.ingest', 'src.router', 'src.understand', 'src.validate',
+                   'src.planner', 'src.evidence', 'src.store', 'src.lineage', 'src.pipeline']
+
+IMPORT_REPORT = {}
+for _module_name in SERVING_MODULES:
+    _start = time.perf_counter()
+    importlib.import_module(_module_name)
+    IMPORT_REPORT[_module_name] = round((time.perf_counter() - _start) * 1000, 2)
+IMPORT_REPORT['total'] = round((time.perf_counter() - _BOOT_START) * 1000, 2)
+
+for _module_name, _elapsed_ms in IMPORT_REPORT.items():
+    COLD_START_MS.set(_elapsed_ms, module=_module_name)
+
+from src.ingest import process_transcript_from_text
+from src.pipeline import run_pipeline, warmup, PIPELINE_VERSION
+from src.store import get_store, compute_content_hash
+from src.lineage import get_linker, summarize_lineage
+
 app = Flask(__name__)
 
+@app.after_request
+def count_request(response):
+    HTTP_REQUESTS.inc(endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+                      method=request.method, status=str(response.status_code))
+    return response
+
 @app.route('/')
 def health_check():
     return jsonify({
@@ -19,7 +54,12 @@ def health_check():
         "version": "1.0",
         "endpoints": {
             "health": "GET /",
-            "analyze": "POST /analyze"
+            "analyze": "POST /analyze",
+            "tasks": "GET /tasks",
+            "meeting": "GET /meetings/<meeting_id>",
+            "update_task": "PATCH /tasks/<task_id>",
+            "series_tasks": "GET /series/<series_id>/tasks",
+            "metrics": "GET /metrics"
         }
     })
 
@@ -34,48 +74,192 @@ def analyze_meeting():
             return jsonify({"success": False, "error": "Missing 'transcript' in request body"}), 400
         
         transcript = data.get('transcript', '')
+        include_timings = bool(data.get('include_timings')) or request.args.get('timings') == '1'
         
         if not transcript.strip():
             return jsonify({"success": False, "error": "Transcript cannot be empty"}), 400
         
-        # Import and use our pipeline
-        try:
-            from src.ingest import process_transcript_from_text
-            from src.understand import analyze_meeting
-            from src.validate import validate_tasks, deduplicate_tasks
-            from src.planner import plan_tasks
-        except ImportError as e:
-            return jsonify({"success": False, "error": f"Module import error: {str(e)}"}), 500
+        # Relative deadlines ("next Friday") are resolved against the meeting date
+        meeting_date = data.get('meeting_date')
+        if meeting_date:
+            try:
+                meeting_date = date.fromisoformat(meeting_date).isoformat()
+            except (TypeError, ValueError):
+                return jsonify({"success": False, "error": "'meeting_date' must be an ISO date (YYYY-MM-DD)"}), 400
         
         # Run the pipeline
+        start_request_timings()
         try:
-            analysis_results = analyze_meeting(transcript)
-            tasks = analysis_results.get('tasks', [])
-            participants = analysis_results.get('participants', [])
+            transcript = process_transcript_from_text(transcript)
+            meeting_id = compute_content_hash(transcript)
+            store = get_store()
+            
+            # Re-submitted transcripts are served from the store, unless they
+            # were analyzed by an older pipeline version
+            with stage_timer('store'):
+                stored = store.get_analysis(meeting_id)
+            if stored is not None and stored['pipeline_version'] == PIPELINE_VERSION:
+                stored = _link_series(stored, data.get('series_id'))
+                return jsonify({"success": True, "cached": True, **stored, **_timings(include_timings)})
             
-            validated_tasks = validate_tasks(tasks, participants)
-            deduplicated_tasks = deduplicate_tasks(validated_tasks)
-            planned_tasks = plan_tasks(deduplicated_tasks)
+            results = run_pipeline(transcript)
+            
+            # Only store results from a successful extraction
+            if results['tasks'] or results['meeting_summary']:
+                with stage_timer('store'):
+                    store.save_analysis(
+                        meeting_id,
+                        results['tasks'],
+                        meeting_summary=results['meeting_summary'],
+                        decisions=results['decisions'],
+                        participants=results['participants'],
+                        name=data.get('meeting_name'),
+                        meeting_date=meeting_date,
+                        model=results['model'],
+                        pipeline_version=results['pipeline_version'],
+                        replace=stored is not None
+                    )
+                    stored = store.get_analysis(meeting_id)
+                if 'routing' in results:
+                    stored['routing'] = results['routing']
+                stored = _link_series(stored, data.get('series_id'))
+                return jsonify({"success": True, "cached": False, **stored, **_timings(include_timings)})
             
             return jsonify({
                 "success": True,
-                "tasks": planned_tasks,
-                "meeting_summary": analysis_results.get('meeting_summary', ''),
-                "decisions": analysis_results.get('decisions', []),
-                "participants": participants,
-                "total_tasks": len(planned_tasks)
+                "cached": False,
+                "meeting_id": meeting_id,
+                **results,
+                **_timings(include_timings)
             })
             
         except Exception as e:
+            app.logger.exception("Pipeline execution error")
             return jsonify({"success": False, "error": f"Pipeline execution error: {str(e)}"}), 500
+        finally:
+            pop_request_timings()
         
     except Exception as e:
+        app.logger.exception("Server error")
         return jsonify({"success": False, "error": f"Server error: {str(e)}"}), 500
 
+def _link_series(analysis: dict, series_id: str) -> dict:
+    """
+    Attach lineage labels when the meeting belongs to a recurring series.
+    """
+    if not series_id:
+        return analysis
+    tasks = get_linker().link_tasks(series_id, analysis['meeting_id'], analysis['tasks'])
+    return {**analysis, "series_id": series_id, "tasks": tasks, "lineage_summary": summarize_lineage(tasks)}
+
+def _timings(include_timings: bool) -> dict:
+    """
+    Per-request stage breakdown in milliseconds, when requested.
+    Nested stages (gemini_call, parse) are also counted inside 'understand'.
+    """
+    if not include_timings:
+        return {}
+    return {"timings_ms": pop_request_timings() or {}}
+
+@app.route('/tasks', methods=['GET'])
+def list_tasks():
+    """
+    Query stored tasks.
+    
+    Query params: owner, priority, meeting_id, status, deadline, due_before, due_after
+    (ISO dates), limit, cursor (from the previous page's next_cursor).
+    """
+    try:
+        try:
+            limit = int(request.args.get('limit', 50))
+            cursor = request.args.get('cursor')
+            cursor = int(cursor) if cursor else None
+        except ValueError:
+            return jsonify({"success": False, "error": "'limit' and 'cursor' must be integers"}), 400
+        
+        tasks, next_cursor = get_store().query_tasks(
+            owner=request.args.get('owner'),
+            priority=request.args.get('priority'),
+            meeting_id=request.args.get('meeting_id'),
+            status=request.args.get('status'),
+            deadline=request.args.get('deadline'),
+            due_before=request.args.get('due_before'),
+            due_after=request.args.get('due_after'),
+            limit=limit,
+            after=cursor
+        )
+        return jsonify({"success": True, "tasks": tasks, "count": len(tasks), "next_cursor": next_cursor})
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Server error: {str(e)}"}), 500
+
+@app.route('/tasks/<int:task_id>', methods=['PATCH'])
+def update_task(task_id):
+    """
+    Update a stored task's status (open/done/cancelled), and the status of
+    any recurring-series task it is linked to.
+    """
+    try:
+        data = request.json
+        if not data or 'status' not in data:
+            return jsonify({"success": False, "error": "Missing 'status' in request body"}), 400
+        
+        try:
+            updated = get_store().update_task_status(task_id, data['status'])
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        
+        if not updated:
+            return jsonify({"success": False, "error": f"Task {task_id} not found"}), 404
+        # Keep recurring-series tracking in step with the task's status
+        series_tasks_updated = get_linker().sync_task_status(task_id, data['status'])
+        return jsonify({"success": True, "task_id": task_id, "status": data['status'],
+                        "series_tasks_updated": series_tasks_updated})
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Server error: {str(e)}"}), 500
+
+@app.route('/meetings/<meeting_id>', methods=['GET'])
+def get_meeting(meeting_id):
+    """
+    Return a stored meeting analysis by its id (transcript content hash).
+    """
+    try:
+        stored = get_store().get_analysis(meeting_id)
+        if stored is None:
+            return jsonify({"success": False, "error": f"Meeting {meeting_id} not found"}), 404
+        return jsonify({"success": True, **stored})
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Server error: {str(e)}"}), 500
+
+@app.route('/series/<series_id>/tasks', methods=['GET'])
+def list_series_tasks(series_id):
+    """
+    Open tasks tracked for a recurring meeting series (optional ?owner=).
+    """
+    try:
+        try:
+            limit = int(request.args.get('limit', 100))
+        except ValueError:
+            return jsonify({"success": False, "error": "'limit' must be an integer"}), 400
+        
+        tasks = get_linker().open_tasks(series_id, owner=request.args.get('owner'), limit=limit)
+        return jsonify({"success": True, "series_id": series_id, "tasks": tasks, "count": len(tasks)})
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Server error: {str(e)}"}), 500
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "meeting-execution-agent"})
+    return jsonify({"status": "healthy", "service": "meeting-execution-agent", "cold_start_ms": IMPORT_REPORT})
 
 if __name__ == '__main__':
+    warmup()
     app.run(host='0.0.0.0', port=8080, debug=False)
\ No newline at end of file
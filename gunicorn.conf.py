@@ -0,0 +1,43 @@
+# gunicorn.conf.py - Cloud Run serving configuration
+import glob
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv('GUNICORN_WORKERS', '1'))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+
+# Import app.py (and the pipeline modules) once in the master process so
+# workers fork with everything already loaded.
+preload_app = True
+
+def on_starting(server):
+    """
+    With several workers, /metrics must aggregate across processes: give the
+    workers a shared snapshot directory (METRICS_MULTIPROC_DIR, or a fresh
+    temporary one) and clear snapshots left over from a previous run.
+    """
+    if workers <= 1:
+        return
+    directory = os.getenv('METRICS_MULTIPROC_DIR')
+    if not directory:
+        directory = tempfile.mkdtemp(prefix='meeting-agent-metrics-')
+        os.environ['METRICS_MULTIPROC_DIR'] = directory
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+    server.log.info(f"Aggregating metrics across {workers} workers via {directory}")
+
+def post_fork(server, worker):
+    """
+    Warm up each worker. The Gemini client holds network channels that must
+    not be shared across fork, so it is created here rather than at preload.
+    """
+    from app import warmup, IMPORT_REPORT
+    from src.metrics import enable_multiprocess
+
+    if os.getenv('METRICS_MULTIPROC_DIR'):
+        enable_multiprocess(os.environ['METRICS_MULTIPROC_DIR'])
+    warmup()
+    server.log.info(f"Worker {worker.pid} ready, cold start import report (ms): {IMPORT_REPORT}")
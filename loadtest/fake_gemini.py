@@ -0,0 +1,172 @@
+# loadtest/fake_gemini.py
+"""
+Local stand-in for the Gemini generateContent REST API.
+
+Usage:
+    python loadtest/fake_gemini.py --port 8090 --latency-ms 800 --jitter-ms 300 --error-rate 0.02 --tasks 8
+
+Point the app at it with GEMINI_API_ENDPOINT=http://127.0.0.1:8090. Responses
+are built from the speaker lines in the prompt, so owners and evidence quotes
+look like the real thing to validate/evidence anchoring.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SPEAKER_LINE = re.compile(r'^\s*([A-Z][\w .\'-]{0,30}):\s*(.+)$', re.MULTILINE)
+# Packed prompts label meetings m1, m2, ...; the system prompt's example
+# <meeting id="..."> tag must not be taken for a meeting
+MEETING_BLOCK = re.compile(r'<meeting id="(m\d+)">(.*?)</meeting>', re.DOTALL)
+
+
+class FakeGeminiConfig:
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float, tasks: int, seed: int = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.tasks = tasks
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def sample_latency(self) -> float:
+        with self.lock:
+            return max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return failed
+
+
+def build_meeting_result(transcript: str, task_count: int) -> dict:
+    """
+    Build a single-meeting extraction result from the transcript's speaker lines.
+    """
+    lines = SPEAKER_LINE.findall(transcript)
+    participants = sorted({speaker.strip() for speaker, _ in lines}) or ['Speaker A']
+    tasks = []
+    for i in range(task_count):
+        speaker, text = lines[i % len(lines)] if lines else ('Speaker A', 'No transcript lines')
+        sentence = text.strip().split('. ')[0][:200]
+        tasks.append({
+            "title": f"Follow up on item {i + 1}",
+            "description": f"Follow up on: {sentence}",
+            "owner": participants[i % len(participants)],
+            "deadline": "next Friday" if i % 2 else "TBD",
+            "priority": ("High", "Medium", "Low")[i % 3],
+            "confidence": 0.9,
+            "evidence": sentence
+        })
+    return {
+        "tasks": tasks,
+        "meeting_summary": "Load test meeting summary.",
+        "decisions": ["Load test decision"],
+        "participants": participants
+    }
+
+
+def build_response_text(user_prompt: str, task_count: int) -> str:
+    """
+    Build the model's JSON text for a single or packed user prompt (the
+    request's last part; the system prompt comes first).
+    """
+    meetings = MEETING_BLOCK.findall(user_prompt)
+    if meetings:
+        return json.dumps({"meetings": {label: build_meeting_result(text, task_count)
+                                        for label, text in meetings}})
+    transcript = user_prompt.split('MEETING TRANSCRIPT:', 1)[-1]
+    return json.dumps(build_meeting_result(transcript, task_count))
+
+
+def make_handler(config: FakeGeminiConfig):
+    class FakeGeminiHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if ':generateContent' not in self.path:
+                return self._send(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+            time.sleep(config.sample_latency())
+            if config.should_fail():
+                return self._send(503, {"error": {"code": 503, "message": "Injected failure", "status": "UNAVAILABLE"}})
+
+            try:
+                request = json.loads(body or b'{}')
+                parts = [part.get('text', '')
+                         for content in request.get('contents', [])
+                         for part in content.get('parts', [])]
+            except (ValueError, AttributeError):
+                return self._send(400, {"error": {"code": 400, "message": "Bad request", "status": "INVALID_ARGUMENT"}})
+
+            prompt = '\n'.join(parts)
+            text = build_response_text(parts[-1] if parts else '', config.tasks)
+            self._send(200, {
+                "candidates": [{
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0
+                }],
+                "usageMetadata": {
+                    "promptTokenCount": len(prompt) // 4,
+                    "candidatesTokenCount": len(text) // 4,
+                    "totalTokenCount": (len(prompt) + len(text)) // 4
+                }
+            })
+
+        def do_GET(self):
+            self._send(200, {"status": "ok", "requests": config.requests, "errors": config.errors})
+
+        def _send(self, status: int, payload: dict):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeGeminiHandler
+
+
+def serve(port: int, config: FakeGeminiConfig) -> ThreadingHTTPServer:
+    """
+    Create the stand-in server (call serve_forever() on the result).
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(config))
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Gemini API stand-in for load testing.")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency-ms', type=float, default=800, help="Mean response latency")
+    parser.add_argument('--jitter-ms', type=float, default=200, help="Std deviation of latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of calls answered with 503")
+    parser.add_argument('--tasks', type=int, default=8, help="Tasks per meeting in each response")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = FakeGeminiConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.tasks, args.seed)
+    server = serve(args.port, config)
+    print(f"Fake Gemini listening on http://127.0.0.1:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,375 @@
+# loadtest/run_load.py
+"""
+Load test for the HTTP API against a local Gemini stand-in.
+
+Starts loadtest/fake_gemini.py and app.py under gunicorn (unless --target is
+given), then drives /analyze (plus a share of GET /tasks reads) at increasing
+concurrency. Reports throughput, p50/p95/p99 latency, error rate and
+peak per-worker memory for each step.
+
+Usage:
+    python loadtest/run_load.py --workers 2 --threads 8 --concurrency 1,4,8,16,32 --duration 30
+    python loadtest/run_load.py --output loadtest/results.json
+    python loadtest/run_load.py --baseline loadtest/results.json --max-throughput-drop 0.1
+
+Per-worker memory is read from /proc and is only available on Linux when the
+server is started by this script.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from typing import List, Dict, Any, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def http_request(url: str, payload: dict = None, timeout: float = 300):
+    """
+    Send a GET (or POST when payload is given). Returns (status, elapsed_seconds).
+    """
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+            if status == 200 and payload is not None:
+                # A 200 with success=false or a failed extraction still counts as an error
+                parsed = json.loads(body)
+                if not parsed.get('success') or parsed.get('extraction_error'):
+                    status = 599
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def load_transcripts() -> List[str]:
+    paths = sorted(glob.glob(os.path.join(REPO_ROOT, 'data', 'sample_transcripts', '*.txt')))
+    transcripts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            transcripts.append(f.read())
+    return transcripts or ["Alex: Let's sync.\n\nSam: I'll send the report by Friday."]
+
+
+def run_step(base_url: str, concurrency: int, duration: float, transcripts: List[str],
+             read_ratio: float, master_pid: Optional[int] = None,
+             memory_interval: float = 0.5) -> Dict[str, Any]:
+    """
+    Drive the API with `concurrency` closed-loop clients for `duration` seconds.
+
+    Server memory is sampled every `memory_interval` seconds while the step
+    runs, and the peak is reported.
+    """
+    results = {'analyze': [], 'tasks': []}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(client_id: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            if read_ratio and (i % max(1, round(1 / read_ratio))) == 0:
+                kind = 'tasks'
+                status, elapsed = http_request(f"{base_url}/tasks?limit=50")
+            else:
+                kind = 'analyze'
+                # Unique transcript per request so the task store cache is never hit. The marker
+                # has no colon, so it is not parsed as a speaker line.
+                transcript = transcripts[(client_id + i) % len(transcripts)] + f"\n\n(run {uuid.uuid4().hex})"
+                status, elapsed = http_request(f"{base_url}/analyze", {"transcript": transcript})
+            with lock:
+                results[kind].append((status, elapsed))
+
+    sampler = MemorySampler(master_pid, memory_interval)
+    sampler.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    sampler.stop()
+
+    step = {'concurrency': concurrency, 'wall_seconds': round(wall, 2), 'memory': sampler.peak()}
+    for kind, samples in results.items():
+        ok = [elapsed for status, elapsed in samples if status == 200]
+        errors = len(samples) - len(ok)
+        step[kind] = {
+            'requests': len(samples),
+            'throughput_rps': round(len(ok) / wall, 2) if wall else 0.0,
+            'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+            'p50_ms': round(percentile(ok, 50) * 1000, 1),
+            'p95_ms': round(percentile(ok, 95) * 1000, 1),
+            'p99_ms': round(percentile(ok, 99) * 1000, 1)
+        }
+    return step
+
+
+def child_pids(parent_pid: int) -> List[int]:
+    pids = []
+    for stat_path in glob.glob('/proc/[0-9]*/stat'):
+        try:
+            with open(stat_path) as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            if int(fields[1]) == parent_pid:
+                pids.append(int(stat_path.split('/')[2]))
+        except (OSError, IndexError, ValueError):
+            continue
+    return pids
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def worker_memory(master_pid: Optional[int]) -> Dict[int, float]:
+    """
+    Resident memory of the gunicorn master and each worker, in MB, by pid.
+    """
+    if master_pid is None or not os.path.exists('/proc'):
+        return {}
+    memory = {pid: rss_mb(pid) for pid in [master_pid] + child_pids(master_pid)}
+    return {pid: value for pid, value in memory.items() if value is not None}
+
+
+class MemorySampler:
+    """
+    Samples server RSS on a background thread and keeps the peak per process
+    and the peak total, so short-lived spikes during a step are not missed.
+    """
+
+    def __init__(self, master_pid: Optional[int], interval: float = 0.5):
+        self.master_pid = master_pid
+        self.interval = interval
+        self.peak_by_pid: Dict[int, float] = {}
+        self.peak_total = 0.0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        if self.master_pid is not None:
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread.is_alive():
+            self._stop.set()
+            self._thread.join()
+        self.sample()
+
+    def sample(self) -> None:
+        memory = worker_memory(self.master_pid)
+        if not memory:
+            return
+        self.samples += 1
+        for pid, value in memory.items():
+            self.peak_by_pid[pid] = max(value, self.peak_by_pid.get(pid, 0.0))
+        self.peak_total = max(self.peak_total, round(sum(memory.values()), 1))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def peak(self) -> Dict[str, Any]:
+        """
+        Peak RSS in MB over the samples taken (master, each worker, total).
+        """
+        if not self.samples:
+            return {}
+        workers = [value for pid, value in self.peak_by_pid.items() if pid != self.master_pid]
+        return {
+            'samples': self.samples,
+            'master_rss_mb': self.peak_by_pid.get(self.master_pid),
+            'worker_rss_mb': workers,
+            'max_worker_rss_mb': max(workers) if workers else None,
+            'total_rss_mb': self.peak_total
+        }
+
+
+def wait_for(url: str, timeout: float = 60) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status, _ = http_request(url, timeout=2)
+        if status == 200:
+            return
+        time.sleep(0.25)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def start_servers(args, store_dir: str):
+    """
+    Start the Gemini stand-in and gunicorn. Returns (processes, gunicorn pid, base url).
+    """
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, 'loadtest', 'fake_gemini.py'),
+         '--port', str(args.fake_port), '--latency-ms', str(args.fake_latency_ms),
+         '--jitter-ms', str(args.fake_jitter_ms), '--error-rate', str(args.fake_error_rate),
+         '--tasks', str(args.fake_tasks), '--seed', '42'],
+        stdout=subprocess.DEVNULL
+    )
+    wait_for(f"http://127.0.0.1:{args.fake_port}/")
+
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(args.port),
+        'GUNICORN_WORKERS': str(args.workers),
+        'GUNICORN_THREADS': str(args.threads),
+        'GEMINI_API_ENDPOINT': f"http://127.0.0.1:{args.fake_port}",
+        'GOOGLE_API_KEY': env.get('LOADTEST_API_KEY', 'loadtest'),
+        'TASK_STORE_PATH': os.path.join(store_dir, 'task_store.db')
+    })
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    wait_for(f"{base_url}/health", timeout=120)
+    return [server, fake], server.pid, base_url
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline_path: str, max_drop: float) -> List[str]:
+    """
+    List concurrency levels whose /analyze throughput fell more than max_drop below the baseline.
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    baseline_steps = {step['concurrency']: step for step in baseline.get('steps', [])}
+
+    regressions = []
+    for step in report['steps']:
+        previous = baseline_steps.get(step['concurrency'])
+        if previous is None:
+            continue
+        before = previous['analyze']['throughput_rps']
+        after = step['analyze']['throughput_rps']
+        if before and after < before * (1 - max_drop):
+            regressions.append(f"concurrency {step['concurrency']}: {before} -> {after} req/s")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    config = report['config']
+    print(f"\n📊 LOAD TEST: workers={config['workers']} threads={config['threads']} "
+          f"fake latency={config['fake_latency_ms']}ms error rate={config['fake_error_rate']}")
+    print("=" * 102)
+    print(f"{'conc':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8} "
+          f"{'reads/s':>8} {'peak worker MB':>15} {'peak total MB':>14}")
+    for step in report['steps']:
+        analyze, reads, memory = step['analyze'], step['tasks'], step.get('memory', {})
+        print(f"{step['concurrency']:>5} {analyze['throughput_rps']:>8} {analyze['p50_ms']:>9} "
+              f"{analyze['p95_ms']:>9} {analyze['p99_ms']:>9} {analyze['error_rate']:>8.2%} "
+              f"{reads['throughput_rps']:>8} {str(memory.get('max_worker_rss_mb', '-')):>15} "
+              f"{str(memory.get('total_rss_mb', '-')):>14}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Meeting Execution Agent API.")
+    parser.add_argument('--target', help="Base URL of an already running server (skips starting servers)")
+    parser.add_argument('--port', type=int, default=8085)
+    parser.add_argument('--workers', type=int, default=1, help="gunicorn workers")
+    parser.add_argument('--threads', type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help="Comma-separated client counts")
+    parser.add_argument('--duration', type=float, default=20, help="Seconds per concurrency step")
+    parser.add_argument('--read-ratio', type=float, default=0.1, help="Share of requests that are GET /tasks")
+    parser.add_argument('--fake-port', type=int, default=8090)
+    parser.add_argument('--fake-latency-ms', type=float, default=800)
+    parser.add_argument('--fake-jitter-ms', type=float, default=200)
+    parser.add_argument('--fake-error-rate', type=float, default=0.0)
+    parser.add_argument('--fake-tasks', type=int, default=8, help="Tasks per response (response size)")
+    parser.add_argument('--memory-interval', type=float, default=0.5,
+                        help="Seconds between server memory samples during a step")
+    parser.add_argument('--output', help="Write the JSON report here")
+    parser.add_argument('--baseline', help="Previous JSON report to compare throughput against")
+    parser.add_argument('--max-throughput-drop', type=float, default=0.1,
+                        help="Allowed fractional throughput drop vs the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    transcripts = load_transcripts()
+    processes = []
+    master_pid = None
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        try:
+            if args.target:
+                base_url = args.target.rstrip('/')
+            else:
+                processes, master_pid, base_url = start_servers(args, store_dir)
+
+            steps = []
+            for concurrency in levels:
+                print(f"🚀 concurrency={concurrency} for {args.duration}s ...", flush=True)
+                steps.append(run_step(base_url, concurrency, args.duration, transcripts, args.read_ratio,
+                                      master_pid, args.memory_interval))
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    report = {
+        'config': {
+            'target': args.target, 'workers': args.workers, 'threads': args.threads,
+            'duration': args.duration, 'read_ratio': args.read_ratio,
+            'fake_latency_ms': args.fake_latency_ms, 'fake_jitter_ms': args.fake_jitter_ms,
+            'fake_error_rate': args.fake_error_rate, 'fake_tasks': args.fake_tasks
+        },
+        'steps': steps
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, args.baseline, args.max_throughput_drop)
+        if regressions:
+            print("\n❌ Throughput regressions:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print("\n✅ No throughput regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -3,7 +3,9 @@ import json
 import csv
 from typing import List, Dict, Any
 from datetime import datetime
+from .metrics import stage_timer
 
+@stage_timer('action')
 def generate_followup_email(meeting_summary: str, tasks: List[Dict[str, Any]], participants: List[str]) -> str:
     """
     Generate a follow-up email draft summarizing the meeting outcomes.
@@ -39,6 +41,7 @@ Meeting Assistant
 
     return email_subject, email_body
 
+@stage_timer('action')
 def export_to_csv(tasks: List[Dict[str, Any]], filename: str) -> None:
     """
     Export tasks to CSV format.
@@ -57,6 +60,7 @@ def export_to_csv(tasks: List[Dict[str, Any]], filename: str) -> None:
             row = {field: task.get(field, '') for field in fieldnames}
             writer.writerow(row)
 
+@stage_timer('action')
 def export_to_json(tasks: List[Dict[str, Any]], filename: str) -> None:
     """
     Export tasks to JSON format.
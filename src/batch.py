@@ -0,0 +1,355 @@
+# src/batch.py
+"""
+Resumable batch runner for a directory of transcripts.
+
+Usage:
+    python -m src.batch data/sample_transcripts --output-dir assets/batch_results --workers 4
+
+Each transcript gets a <meeting_id>_output.json in the output directory and a
+line in manifest.jsonl recording its content hash. Re-running skips every
+transcript whose hash and pipeline version match the manifest, so after a
+crash (or on a growing archive) only new or changed meetings are processed.
+"""
+import argparse
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+from .ingest import process_transcript
+from .pipeline import PIPELINE_VERSION, run_pipeline, run_packed_pipeline
+from .router import summarize_routing
+from .store import compute_content_hash
+
+MANIFEST_NAME = 'manifest.jsonl'
+# With --pack, transcripts are read and packed this many at a time
+PACK_SCAN_CHUNK = int(os.getenv('BATCH_PACK_CHUNK', '64'))
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the manifest, keeping the latest record per meeting id.
+
+    A torn final line (from a crash mid-write) is ignored.
+    """
+    records: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(manifest_path):
+        return records
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and 'meeting_id' in record:
+                records[record['meeting_id']] = record
+    return records
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write JSON to a temp file in the same directory, then rename it into place.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class BatchRunner:
+    """
+    Processes a transcript directory, skipping meetings that are already done.
+    """
+
+    def __init__(self, input_dir: str, output_dir: str, pattern: str = '*.txt', workers: int = 4,
+                 pack: bool = False, force: bool = False, save_to_store: bool = False):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.pattern = pattern
+        self.workers = workers
+        self.pack = pack
+        self.force = force
+        self.save_to_store = save_to_store
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self._manifest_lock = threading.Lock()
+        self.skipped = 0
+
+    def output_path(self, meeting_id: str) -> str:
+        return os.path.join(self.output_dir, f"{meeting_id}_output.json")
+
+    def is_up_to_date(self, record: Optional[Dict[str, Any]], content_hash: str) -> bool:
+        """
+        Check a manifest record against the current transcript hash and pipeline version.
+        """
+        return (record is not None
+                and record.get('content_hash') == content_hash
+                and record.get('pipeline_version') == PIPELINE_VERSION
+                and os.path.exists(self.output_path(record['meeting_id'])))
+
+    def scan(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield transcripts that may need processing, without reading them.
+
+        Files whose size and mtime match the manifest are skipped on a stat
+        alone. The rest are yielded as lightweight jobs (path, size, mtime);
+        workers read and hash them, so memory does not grow with the archive.
+        """
+        manifest = {} if self.force else load_manifest(self.manifest_path)
+
+        for path in sorted(glob.glob(os.path.join(self.input_dir, self.pattern))):
+            meeting_id = os.path.splitext(os.path.basename(path))[0]
+            stat = os.stat(path)
+            record = manifest.get(meeting_id)
+
+            if (record is not None and record.get('size') == stat.st_size
+                    and record.get('mtime_ns') == stat.st_mtime_ns
+                    and self.is_up_to_date(record, record.get('content_hash'))):
+                self._count_skipped()
+                continue
+
+            yield {
+                'meeting_id': meeting_id,
+                'path': path,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'record': record
+            }
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Process all pending transcripts concurrently.
+
+        Jobs are streamed into the executor as the directory is scanned, with
+        at most 2 x workers units of work queued at a time.
+
+        Returns:
+            Dict[str, Any]: Counts of processed, skipped and failed meetings,
+            plus escalation rates when the model cascade routed any of them
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        start = time.perf_counter()
+        self.skipped = 0
+
+        print("📦 BATCH PROCESSING")
+        print("=" * 60)
+
+        processed, failed, routings = [], [], []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = {}
+            for group in self._groups(self.scan()):
+                if len(in_flight) >= self.workers * 2:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._collect(finished, in_flight, processed, failed, routings)
+                in_flight[executor.submit(self._process_group, group)] = group
+            self._collect(list(in_flight), in_flight, processed, failed, routings)
+
+        summary = {
+            'processed': len(processed),
+            'skipped': self.skipped,
+            'failed': len(failed),
+            'failed_meetings': sorted(failed),
+            'elapsed_seconds': round(time.perf_counter() - start, 2)
+        }
+        print(f"\n📈 Processed: {summary['processed']} | Skipped: {summary['skipped']} | "
+              f"Failed: {summary['failed']} | {summary['elapsed_seconds']}s")
+        if routings:
+            summary['routing'] = summarize_routing(routings)
+            print(f"🔀 Escalated: {summary['routing']['escalated']}/{summary['routing']['total']} "
+                  f"({summary['routing']['escalation_rate']:.1%}) | "
+                  f"Strong model failed: {summary['routing']['strong_failed']}")
+        return summary
+
+    def _collect(self, futures, in_flight: Dict[Any, List[Dict[str, Any]]],
+                 processed: List[str], failed: List[str], routings: List[Dict[str, Any]]) -> None:
+        """
+        Record the outcome of finished units of work and drop them from in_flight.
+        """
+        for future in futures:
+            group = in_flight.pop(future)
+            try:
+                done, errors, group_routings = future.result()
+            except Exception as e:
+                done, errors, group_routings = [], [(job['meeting_id'], str(e)) for job in group], []
+            routings.extend(group_routings)
+            for meeting_id in done:
+                processed.append(meeting_id)
+                print(f"   ✅ {meeting_id}")
+            for meeting_id, error in errors:
+                failed.append(meeting_id)
+                print(f"   ❌ {meeting_id}: {error}")
+
+    def _groups(self, jobs: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Split jobs into units of work: one per meeting, or chunks of
+        PACK_SCAN_CHUNK meetings that are packed together once read.
+        """
+        chunk_size = PACK_SCAN_CHUNK if self.pack else 1
+        group = []
+        for job in jobs:
+            group.append(job)
+            if len(group) >= chunk_size:
+                yield group
+                group = []
+        if group:
+            yield group
+
+    def _prepare(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Read and hash a job's transcript.
+
+        Returns:
+            The job with its transcript and content hash, or None if the file
+            is empty or its content is unchanged since the last run
+        """
+        transcript = process_transcript(job['path'])
+        if not transcript:
+            print(f"   ⚠️ Skipping empty transcript: {job['path']}")
+            return None
+        content_hash = compute_content_hash(transcript)
+
+        record = job['record']
+        if self.is_up_to_date(record, content_hash):
+            # Touched but unchanged: refresh size/mtime so the next scan skips it cheaply
+            self._append_manifest({**record, 'size': job['size'], 'mtime_ns': job['mtime_ns']})
+            self._count_skipped()
+            return None
+
+        return {**job, 'transcript': transcript, 'content_hash': content_hash}
+
+    def _process_group(self, group: List[Dict[str, Any]]):
+        """
+        Read, hash and run the pipeline for a group of jobs, and persist
+        successful results.
+
+        Returns:
+            Tuple of processed meeting ids, (meeting id, error) pairs and the
+            routing records of cascade-routed meetings
+        """
+        jobs = [prepared for prepared in map(self._prepare, group) if prepared is not None]
+        if not jobs:
+            return [], [], []
+
+        if self.pack:
+            results = run_packed_pipeline({job['meeting_id']: job['transcript'] for job in jobs})
+        else:
+            results = {job['meeting_id']: run_pipeline(job['transcript']) for job in jobs}
+
+        done, errors = [], []
+        routings = [result['routing'] for result in results.values() if result and result.get('routing')]
+        for job in jobs:
+            result = results.get(job['meeting_id'])
+            if result is None or result.get('extraction_error'):
+                errors.append((job['meeting_id'], (result or {}).get('extraction_error', 'No result')))
+                continue
+            self._save(job, result)
+            done.append(job['meeting_id'])
+        return done, errors, routings
+
+    def _count_skipped(self) -> None:
+        with self._manifest_lock:
+            self.skipped += 1
+
+    def _save(self, job: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        Write the output file, then record it in the manifest.
+
+        The manifest line is appended only after the output is in place, so a
+        crash between the two just means the meeting is redone next run.
+        """
+        output_path = self.output_path(job['meeting_id'])
+        write_json_atomic(output_path, {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "meeting_file": os.path.basename(job['path']),
+                "total_tasks": result.get('total_tasks', len(result.get('tasks', []))),
+                "content_hash": job['content_hash'],
+                "pipeline_version": PIPELINE_VERSION
+            },
+            "analysis_results": result
+        })
+
+        if self.save_to_store:
+            from .store import get_store
+            get_store().save_analysis(job['content_hash'], result.get('tasks', []),
+                                      meeting_summary=result.get('meeting_summary', ''),
+                                      decisions=result.get('decisions', []),
+                                      participants=result.get('participants', []),
+                                      name=job['meeting_id'], model=result.get('model'),
+                                      pipeline_version=PIPELINE_VERSION, replace=True)
+
+        self._append_manifest({
+            'meeting_id': job['meeting_id'],
+            'content_hash': job['content_hash'],
+            'pipeline_version': PIPELINE_VERSION,
+            'output': os.path.basename(output_path),
+            'size': job['size'],
+            'mtime_ns': job['mtime_ns'],
+            'completed_at': datetime.now().isoformat()
+        })
+
+    def _append_manifest(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record) + '\n'
+        with self._manifest_lock:
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def compact_manifest(manifest_path: str) -> int:
+    """
+    Rewrite the manifest with one line per meeting. Returns the number of records.
+    """
+    records = load_manifest(manifest_path)
+    directory = os.path.dirname(manifest_path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.jsonl')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for record in records.values():
+            f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, manifest_path)
+    return len(records)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process a directory of meeting transcripts.")
+    parser.add_argument('input_dir', help="Directory containing transcript files")
+    parser.add_argument('--output-dir', default='assets/batch_results', help="Where to write <meeting>_output.json files")
+    parser.add_argument('--pattern', default='*.txt', help="Glob for transcript files (default: *.txt)")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent pipeline workers (default: 4)")
+    parser.add_argument('--pack', action='store_true', help="Pack small transcripts into shared model requests")
+    parser.add_argument('--force', action='store_true', help="Ignore the manifest and reprocess everything")
+    parser.add_argument('--store', action='store_true', help="Also save results to the task store")
+    parser.add_argument('--compact', action='store_true', help="Compact the manifest after the run")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    runner = BatchRunner(args.input_dir, args.output_dir, pattern=args.pattern, workers=args.workers,
+                         pack=args.pack, force=args.force, save_to_store=args.store)
+    summary = runner.run()
+
+    if args.compact:
+        compact_manifest(runner.manifest_path)
+
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -20,6 +20,8 @@ def generate_task_dashboard(tasks: List[Dict[str, Any]]) -> str:
             .task-header { display: flex; justify-content: space-between; }
             .steps { margin-left: 20px; color: #666; }
             .stats { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }
+            .anchor { color: #888; font-size: 0.9em; }
+            .unanchored { color: #e74c3c; font-size: 0.9em; }
         </style>
     </head>
     <body>
@@ -61,7 +63,7 @@ def generate_task_dashboard(tasks: List[Dict[str, Any]]) -> str:
             <p><strong>Description:</strong> {task.get('description', '')}</p>
             <p><strong>Execution Steps:</strong></p>
             <ol class="steps">{steps_html}</ol>
-            <p><em>Evidence: "{task.get('evidence', '')}"</em></p>
+            <p><em>Evidence: "{task.get('evidence', '')}"</em> {format_evidence_anchor(task)}</p>
         </div>
         """
         tasks_html += task_html
@@ -73,6 +75,19 @@ def generate_task_dashboard(tasks: List[Dict[str, Any]]) -> str:
                        .replace("{low_priority}", str(low_priority))\
                        .replace("{tasks_html}", tasks_html)
 
+def format_evidence_anchor(task: Dict[str, Any]) -> str:
+    """
+    Describe where a task's evidence was found in the transcript.
+    """
+    if 'evidence_anchor' not in task:
+        return ''
+    anchor = task.get('evidence_anchor')
+    if not anchor:
+        return '<span class="unanchored">⚠️ not found in transcript</span>'
+    speaker = f"{anchor['speaker']}, " if anchor.get('speaker') else ''
+    return (f'<span class="anchor" data-start="{anchor["start"]}" data-end="{anchor["end"]}">'
+            f'({speaker}chars {anchor["start"]}-{anchor["end"]}, {anchor["match"]} match)</span>')
+
 def display_task_summary(tasks: List[Dict[str, Any]]) -> None:
     """
     Print a summary of tasks to console.
@@ -3,8 +3,8 @@ import pandas as pd
 import json
 import os
 from typing import List, Dict, Any, Tuple
-from datetime import datetime
-import re
+
+from .text_utils import preprocess_text, jaccard_similarity
 
 def load_ground_truth(csv_path: str) -> pd.DataFrame:
     """
@@ -45,18 +45,6 @@ def load_ai_predictions(json_path: str) -> List[Dict[str, Any]]:
         print(f"❌ Error loading AI predictions: {e}")
         return []
 
-def preprocess_text(text: str) -> str:
-    """
-    Normalize text for comparison.
-    """
-    if not isinstance(text, str):
-        return ""
-    # Convert to lowercase, remove extra spaces, and basic normalization
-    text = text.lower().strip()
-    text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
-    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-    return text
-
 def calculate_task_matching(ground_truth_tasks: List[str], ai_tasks: List[str]) -> Tuple[float, float, float]:
     """
     Calculate precision, recall, and F1 for task extraction.
@@ -82,9 +70,7 @@ def calculate_task_matching(ground_truth_tasks: List[str], ai_tasks: List[str])
             words_gt = set(gt_task.split())
             
             # Calculate Jaccard similarity
-            intersection = len(words_ai.intersection(words_gt))
-            union = len(words_ai.union(words_gt))
-            similarity = intersection / union if union > 0 else 0
+            similarity = jaccard_similarity(words_ai, words_gt)
             
             if similarity > 0.3:  # Threshold for matching
                 true_positives += 1
@@ -0,0 +1,190 @@
+# src/evidence.py
+import re
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+
+from .metrics import stage_timer, EVIDENCE_ANCHORS
+from .text_utils import speaker_turns, as_float
+
+# Tuned on the sample transcripts and the evidence quotes in
+# assets/batch_results (75 quotes), plus 195 synthetic paraphrases
+# (one word dropped, one replaced, one inserted) and 300 quotes placed in
+# the wrong meeting as negatives. Word bigrams with +/-3 tokens of
+# pooling and a 0.6 token-coverage threshold anchor 74/75 real quotes,
+# all 195 paraphrases and no negatives. The earlier setting (trigram
+# vote share >= 0.5, +/-2 pooling) anchored 71/75, 106/195 and 2/300 negatives.
+NGRAM_SIZE = 2
+# Share of a quote's words that must appear in the aligned transcript window
+FUZZY_THRESHOLD = 0.6
+# Short quotes ("I'll coordinate") reach the threshold almost anywhere
+MIN_FUZZY_MATCHED_TOKENS = 4
+# Allowed drift (in tokens) when the model adds or drops a few words
+DIAGONAL_SLACK = 3
+# Alignments (by n-gram votes) that are scored for coverage
+MAX_CANDIDATE_ALIGNMENTS = 8
+# Confidence multiplier for tasks whose evidence cannot be found
+UNANCHORED_PENALTY = 0.5
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class EvidenceIndex:
+    """
+    Word n-gram index over a normalized transcript.
+
+    Quotes are located by looking up their n-grams, so the cost depends on
+    the quote length and how often its n-grams occur, not on transcript size.
+    """
+
+    def __init__(self, transcript: str, ngram_size: int = NGRAM_SIZE):
+        self.transcript = transcript
+        self.ngram_size = ngram_size
+
+        self.tokens: List[str] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        for match in TOKEN_PATTERN.finditer(transcript):
+            self.tokens.append(match.group(0).lower())
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+
+        self.ngrams: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        self.unigrams: Dict[str, List[int]] = defaultdict(list)
+        for position, token in enumerate(self.tokens):
+            self.unigrams[token].append(position)
+            if position + ngram_size <= len(self.tokens):
+                self.ngrams[tuple(self.tokens[position:position + ngram_size])].append(position)
+
+        self.turn_starts: List[int] = []
+        self.turn_speakers: List[str] = []
+        for start, speaker in speaker_turns(transcript):
+            self.turn_starts.append(start)
+            self.turn_speakers.append(speaker)
+
+    def speaker_at(self, offset: int) -> Optional[str]:
+        """
+        Return the speaker whose turn contains the given character offset.
+        """
+        i = bisect_right(self.turn_starts, offset) - 1
+        return self.turn_speakers[i] if i >= 0 else None
+
+    def locate(self, quote: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a quote in the transcript, exactly or approximately.
+
+        Args:
+            quote (str): Evidence quote from a task
+
+        Returns:
+            Optional[Dict[str, Any]]: start/end char offsets, speaker, match type
+            ('exact' or 'fuzzy') and score, or None if the quote is not found
+        """
+        query = [token.lower() for token in TOKEN_PATTERN.findall(quote or '')]
+        if not query:
+            return None
+
+        span = self._exact(query)
+        if span is not None:
+            return self._anchor(span[0], span[1], 'exact', 1.0)
+
+        if len(query) < self.ngram_size:
+            return None
+
+        fuzzy = self._fuzzy(query)
+        if fuzzy is not None:
+            first, last, score = fuzzy
+            return self._anchor(first, last, 'fuzzy', score)
+        return None
+
+    def _exact(self, query: List[str]) -> Optional[Tuple[int, int]]:
+        if len(query) >= self.ngram_size:
+            candidates = self.ngrams.get(tuple(query[:self.ngram_size]), [])
+        else:
+            candidates = self.unigrams.get(query[0], [])
+
+        for position in candidates:
+            if self.tokens[position:position + len(query)] == query:
+                return position, position + len(query) - 1
+        return None
+
+    def _fuzzy(self, query: List[str]) -> Optional[Tuple[int, int, float]]:
+        """
+        Vote for alignments: each shared n-gram votes for the transcript
+        position where the quote would start. Nearby alignments are pooled so
+        small insertions or deletions in the quote still count. The strongest
+        alignments are scored by the share of quote words found in the
+        transcript window they cover, which tolerates reworded phrases that
+        break every n-gram around them.
+        """
+        query_ngrams = [tuple(query[i:i + self.ngram_size]) for i in range(len(query) - self.ngram_size + 1)]
+        votes: Dict[int, List[int]] = defaultdict(list)
+        for offset, ngram in enumerate(query_ngrams):
+            for position in self.ngrams.get(ngram, ()):
+                votes[position - offset].append(position)
+
+        pooled = []
+        for diagonal in votes:
+            positions = set()
+            for nearby in range(diagonal - DIAGONAL_SLACK, diagonal + DIAGONAL_SLACK + 1):
+                positions.update(votes.get(nearby, ()))
+            pooled.append((len(positions), diagonal, positions))
+        pooled.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        query_counts = Counter(query)
+        best = None
+        for _, diagonal, positions in pooled[:MAX_CANDIDATE_ALIGNMENTS]:
+            window = Counter(self.tokens[max(0, diagonal - DIAGONAL_SLACK):diagonal + len(query) + DIAGONAL_SLACK])
+            matched = sum(min(count, window[token]) for token, count in query_counts.items())
+            if best is None or matched > best[2]:
+                best = (min(positions), max(positions) + self.ngram_size - 1, matched)
+
+        if best is None or best[2] < MIN_FUZZY_MATCHED_TOKENS:
+            return None
+        score = best[2] / len(query)
+        if score < FUZZY_THRESHOLD:
+            return None
+        return best[0], best[1], round(score, 3)
+
+    def _anchor(self, first_token: int, last_token: int, match: str, score: float) -> Dict[str, Any]:
+        start = self.starts[first_token]
+        return {
+            "start": start,
+            "end": self.ends[last_token],
+            "speaker": self.speaker_at(start),
+            "match": match,
+            "score": score
+        }
+
+
+def anchor_tasks(tasks: List[Dict[str, Any]], transcript: str) -> List[Dict[str, Any]]:
+    """
+    Verify each task's evidence quote against the transcript.
+
+    Adds 'evidence_anchor' (offsets, speaker, match type, score, or None) and
+    'evidence_anchored' to each task, and lowers confidence for tasks whose
+    evidence cannot be found.
+
+    Args:
+        tasks: Validated tasks
+        transcript: Transcript the tasks were extracted from
+
+    Returns:
+        List of tasks with evidence anchors
+    """
+    with stage_timer('evidence'):
+        index = EvidenceIndex(transcript)
+        anchored_tasks = []
+
+        for task in tasks:
+            anchored_task = task.copy()
+            anchor = index.locate(task.get('evidence', ''))
+            anchored_task['evidence_anchor'] = anchor
+            anchored_task['evidence_anchored'] = anchor is not None
+            anchored_task['confidence'] = as_float(task.get('confidence', 1.0), default=1.0)
+            if anchor is None:
+                anchored_task['confidence'] *= UNANCHORED_PENALTY
+            EVIDENCE_ANCHORS.inc(match=anchor['match'] if anchor else 'unanchored')
+            anchored_tasks.append(anchored_task)
+
+    return anchored_tasks
@@ -1,41 +1,86 @@
 # src/gemini_client.py
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 import os
 import json
+import logging
+import time
 from typing import Dict, Any
 
+from .metrics import stage_timer, TOKENS, PARSE_FAILURES, GEMINI_RETRIES, GEMINI_ERRORS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# Configured key and model instances are reused across calls so the API
+# client is set up once per worker instead of once per request.
+_configured_api_key = None
+_models: Dict[str, Any] = {}
+
+# Only server-side / quota errors are worth retrying; bad requests, auth
+# failures and safety blocks fail the same way every time.
+TRANSIENT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+
 def setup_gemini(api_key: str = None) -> None:
     """
-    Setup Google Gemini API.
+    Setup Google Gemini API. Calling it again with the same key is a no-op.
     
     Args:
         api_key (str): Your Google AI Studio API key. If None, will look for GOOGLE_API_KEY env variable.
     """
+    global _configured_api_key
+    
     if api_key is None:
         api_key = os.getenv('GOOGLE_API_KEY')
     
     if not api_key:
         raise ValueError("Please provide a Google AI Studio API key or set GOOGLE_API_KEY environment variable")
     
-    genai.configure(api_key=api_key)
+    if api_key == _configured_api_key:
+        return
+    
+    # GEMINI_API_ENDPOINT points the client at another server, e.g. the
+    # local stand-in used by loadtest/ (http://127.0.0.1:8090)
+    endpoint = os.getenv('GEMINI_API_ENDPOINT')
+    if endpoint:
+        genai.configure(api_key=api_key, transport='rest', client_options={'api_endpoint': endpoint})
+    else:
+        genai.configure(api_key=api_key)
+    _configured_api_key = api_key
+    _models.clear()
 
-def extract_tasks_from_transcript(transcript: str, model_name: str = "gemini-2.5-flash") -> Dict[str, Any]:
+def get_model(model_name: str = DEFAULT_MODEL) -> Any:
     """
-    Extract tasks from meeting transcript using Gemini.
-    
-    Args:
-        transcript (str): The meeting transcript
-        model_name (str): Gemini model to use
-        
-    Returns:
-        Dict[str, Any]: Structured task extraction results
+    Return a cached GenerativeModel for the given model name.
     """
-    try:
-        # Initialize the model
+    model = _models.get(model_name)
+    if model is None:
         model = genai.GenerativeModel(model_name)
-        
-        # System prompt for task extraction
-        system_prompt = """
+        _models[model_name] = model
+    return model
+
+def record_token_usage(response: Any) -> None:
+    """
+    Record input/output token counts from a Gemini response, if reported.
+    """
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, 'prompt_token_count', None)
+    output_tokens = getattr(usage, 'candidates_token_count', None)
+    if prompt_tokens:
+        TOKENS.observe(prompt_tokens, direction='input')
+    if output_tokens:
+        TOKENS.observe(output_tokens, direction='output')
+
+# System prompt for task extraction
+TASK_EXTRACTION_PROMPT = """
         You are an expert meeting assistant specialized in extracting actionable tasks from meeting transcripts.
         Extract EVERY actionable task mentioned in the meeting, including owner, deadline, priority, and evidence.
 
@@ -51,7 +96,8 @@ def extract_tasks_from_transcript(transcript: str, model_name: str = "gemini-2.5
                     "deadline": "Specific deadline mentioned (e.g., 'next Friday', 'EOD tomorrow') or 'TBD'",
                     "priority": "High/Medium/Low (infer from context)",
                     "confidence": 0.0-1.0 (your confidence in this extraction),
-                    "evidence": "Exact quote from transcript that led to this task"
+                    "evidence": "Exact quote from transcript that led to this task",
+                    "status": "open, or done if the transcript says the work is already finished"
                 }
             ],
             "meeting_summary": "1-2 sentence summary of key decisions and outcomes",
@@ -65,34 +111,99 @@ def extract_tasks_from_transcript(transcript: str, model_name: str = "gemini-2.5
         - If no deadline, use "TBD" 
         - Base priority on urgency language and importance to meeting goals
         - Confidence should reflect certainty in owner, deadline, and task clarity
+        - Use status "done" only when someone reports the work as finished; requests and plans are "open"
         """
+
+def parse_json_response(result_text: str) -> Any:
+    """
+    Parse a JSON model response, stripping markdown code fences if present.
+    
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON
+    """
+    result_text = result_text.strip()
+    if result_text.startswith('```json'):
+        result_text = result_text[7:]
+    elif result_text.startswith('```'):
+        result_text = result_text[3:]
+    if result_text.endswith('```'):
+        result_text = result_text[:-3]
+    return json.loads(result_text)
+
+def generate_json(system_prompt: str, user_prompt: str, model_name: str = DEFAULT_MODEL,
+                  max_retries: int = 2) -> Any:
+    """
+    Call Gemini and parse its JSON response, retrying transient API errors.
+    
+    Args:
+        system_prompt (str): Instructions and output format
+        user_prompt (str): Request content
+        model_name (str): Gemini model to use
+        max_retries (int): Extra attempts on transient Gemini API errors (with exponential backoff)
+        
+    Returns:
+        Any: Parsed JSON response
+        
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON
+        Exception: If the API call fails with a non-transient error, or a
+            transient one persists after all retries
+    """
+    model = get_model(model_name)
+    
+    attempt = 0
+    while True:
+        try:
+            with stage_timer('gemini_call'):
+                response = model.generate_content([system_prompt, user_prompt])
+            break
+        except TRANSIENT_ERRORS:
+            if attempt >= max_retries:
+                raise
+            attempt += 1
+            GEMINI_RETRIES.inc(model=model_name)
+            logger.warning("Gemini call failed, retrying (%d/%d)", attempt, max_retries, exc_info=True)
+            time.sleep(2 ** (attempt - 1))
+    
+    record_token_usage(response)
+    
+    with stage_timer('parse'):
+        try:
+            return parse_json_response(response.text)
+        except json.JSONDecodeError:
+            PARSE_FAILURES.inc(model=model_name)
+            logger.debug("Raw response: %s", response.text)
+            raise
+
+def extract_tasks_from_transcript(transcript: str, model_name: str = DEFAULT_MODEL,
+                                  max_retries: int = 2) -> Dict[str, Any]:
+    """
+    Extract tasks from meeting transcript using Gemini.
+    
+    Args:
+        transcript (str): The meeting transcript
+        model_name (str): Gemini model to use
+        max_retries (int): Extra attempts on transient Gemini API errors (with exponential backoff)
         
-        user_prompt = f"""
+    Returns:
+        Dict[str, Any]: Structured task extraction results
+    """
+    user_prompt = f"""
         MEETING TRANSCRIPT:
         {transcript}
 
         Extract all actionable tasks and meeting outcomes.
         """
-        
-        # Generate response
-        response = model.generate_content([system_prompt, user_prompt])
-        
-        # Parse JSON response
-        result_text = response.text.strip()
-        
-        # Clean the response (remove markdown code blocks if present)
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-            
-        parsed_result = json.loads(result_text)
-        return parsed_result
+    
+    try:
+        return generate_json(TASK_EXTRACTION_PROMPT, user_prompt, model_name=model_name, max_retries=max_retries)
         
     except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        print(f"Raw response: {response.text}")
-        return {"tasks": [], "meeting_summary": "", "decisions": [], "participants": []}
+        logger.error("Error parsing JSON response: %s", e)
+        return {"tasks": [], "meeting_summary": "", "decisions": [], "participants": [],
+                "extraction_error": f"Invalid JSON response: {e}"}
     except Exception as e:
-        print(f"Error calling Gemini API: {e}")
-        return {"tasks": [], "meeting_summary": "", "decisions": [], "participants": []}
\ No newline at end of file
+        GEMINI_ERRORS.inc(model=model_name)
+        logger.error("Error calling Gemini API: %s", e)
+        return {"tasks": [], "meeting_summary": "", "decisions": [], "participants": [],
+                "extraction_error": f"Gemini API error: {e}"}
@@ -1,4 +1,5 @@
 # src/ingest.py
+from .metrics import stage_timer, TRANSCRIPT_CHARS
 
 def load_transcript(file_path: str) -> str:
     """
@@ -44,8 +45,25 @@ def process_transcript(file_path: str) -> str:
     Returns:
         str: Processed transcript content
     """
-    raw_text = load_transcript(file_path)
-    cleaned_text = clean_transcript(raw_text)
+    with stage_timer('ingest'):
+        raw_text = load_transcript(file_path)
+        cleaned_text = clean_transcript(raw_text)
+    TRANSCRIPT_CHARS.observe(len(cleaned_text))
+    return cleaned_text
+
+def process_transcript_from_text(raw_text: str) -> str:
+    """
+    Process a transcript that was received as text (e.g. from the API).
+    
+    Args:
+        raw_text (str): Raw transcript content
+        
+    Returns:
+        str: Processed transcript content
+    """
+    with stage_timer('ingest'):
+        cleaned_text = clean_transcript(raw_text)
+    TRANSCRIPT_CHARS.observe(len(cleaned_text))
     return cleaned_text
 
 # Example usage
@@ -0,0 +1,512 @@
+# src/lineage.py
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Set
+
+from .store import TaskStore, get_store, normalize_owner, normalize_priority, normalize_title
+from .text_utils import word_set, jaccard_similarity
+from .metrics import stage_timer, LINEAGE_LABELS, SERIES_TASKS_AGED
+
+# Same threshold evaluate.calculate_task_matching uses for "same task"
+MATCH_THRESHOLD = 0.3
+# Below this description similarity a matched task counts as updated
+UPDATED_DESCRIPTION_THRESHOLD = 0.6
+# Short/common words are not indexed; they would make posting lists long
+MIN_TOKEN_LENGTH = 3
+STOPWORDS = {'the', 'and', 'for', 'with', 'from', 'that', 'this', 'into', 'onto', 'our', 'new',
+             'will', 'can', 'all', 'any', 'are', 'was', 'has', 'have', 'by', 'to', 'of'}
+
+# Open series tasks not mentioned in this many meetings, or for this many
+# days, are marked stale and leave the match index
+STALE_AFTER_MEETINGS = int(os.getenv('SERIES_STALE_AFTER_MEETINGS', '6'))
+STALE_AFTER_DAYS = int(os.getenv('SERIES_STALE_AFTER_DAYS', '60'))
+
+# Completion is only read from the evidence quote, and only when it reports
+# finished work: "I sent the deck", "the doc is done", "already merged".
+_FINISHED = 'finished|completed|shipped|sent|delivered|merged|closed|resolved|wrapped up|fixed|submitted|shared'
+COMPLETION_PATTERN = re.compile(
+    r"\b(?:i|we|he|she|they)(?:\s+have|\s+has|['’]ve)?\s+(?:already\s+|just\s+)?(?:" + _FINISHED + r")\b"
+    r"|\b(?:is|was|are|were|has been|have been|['’]s)\s+(?:already\s+|now\s+|all\s+)?(?:done|complete|live|"
+    + _FINISHED + r")\b"
+    r"|\balready\s+(?:did|done|" + _FINISHED + r")\b",
+    re.IGNORECASE
+)
+# Requests, plans and conditions earlier in the same sentence ("make sure the
+# doc is done", "once it's merged") mean the work is not finished yet
+NOT_YET_PATTERN = re.compile(
+    r"\b(?:make sure|ensure|need|needs|should|must|will|going to|gonna|can you|could you|please|want|"
+    r"until|before|once|when|if|hope|hopefully|aim|plan|let['’]s|not|yet)\b|['’]ll\b|n['’]t\b",
+    re.IGNORECASE
+)
+
+LINEAGE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series_tasks (
+    series_task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    series_id TEXT NOT NULL,
+    owner_norm TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    deadline TEXT,
+    priority TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    first_meeting_id TEXT NOT NULL,
+    last_meeting_id TEXT NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    last_seen_seq INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+-- Number of meetings linked per series; series_tasks.last_seen_seq refers to it
+CREATE TABLE IF NOT EXISTS series (
+    series_id TEXT PRIMARY KEY,
+    meeting_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+-- Inverted index over open series tasks only. Completed, cancelled and stale
+-- tasks are removed, so lookups stay proportional to the open backlog.
+CREATE TABLE IF NOT EXISTS series_tokens (
+    series_id TEXT NOT NULL,
+    owner_norm TEXT NOT NULL,
+    token TEXT NOT NULL,
+    series_task_id INTEGER NOT NULL REFERENCES series_tasks(series_task_id)
+);
+
+CREATE TABLE IF NOT EXISTS series_links (
+    series_id TEXT NOT NULL,
+    meeting_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    series_task_id INTEGER NOT NULL,
+    similarity REAL,
+    -- Normalized title of the linked task, to detect re-analyzed meetings
+    title TEXT,
+    linked_at TEXT NOT NULL,
+    PRIMARY KEY (series_id, meeting_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_series_tokens ON series_tokens (series_id, owner_norm, token);
+CREATE INDEX IF NOT EXISTS idx_series_tokens_task ON series_tokens (series_task_id);
+CREATE INDEX IF NOT EXISTS idx_series_tasks_status ON series_tasks (series_id, status, series_task_id);
+CREATE INDEX IF NOT EXISTS idx_series_links_meeting ON series_links (meeting_id, position);
+"""
+
+LINEAGE_MIGRATIONS = [
+    ('series_tasks', 'last_seen_seq', 'INTEGER NOT NULL DEFAULT 0'),
+    ('series_links', 'title', 'TEXT'),
+]
+
+LINEAGE_STATUSES = ('new', 'carried_over', 'updated', 'completed')
+# Series task status for each store task status
+SERIES_STATUS_FOR_TASK = {'open': 'open', 'done': 'done', 'cancelled': 'cancelled'}
+
+
+def index_tokens(task: Dict[str, Any]) -> Set[str]:
+    """
+    Tokens used to find candidate matches for a task.
+    """
+    words = word_set(f"{task.get('title', '')} {task.get('description', '')}")
+    return {word for word in words if len(word) >= MIN_TOKEN_LENGTH and word not in STOPWORDS}
+
+
+def reports_completion(evidence: str) -> bool:
+    """
+    Whether an evidence quote says the work is already finished.
+    """
+    for match in COMPLETION_PATTERN.finditer(evidence or ''):
+        sentence_start = max(evidence.rfind(mark, 0, match.start()) for mark in '.!?\n') + 1
+        if not NOT_YET_PATTERN.search(evidence[sentence_start:match.end()]):
+            return True
+    return False
+
+
+def task_similarity(task: Dict[str, Any], candidate: Dict[str, Any]) -> float:
+    """
+    Title similarity, or title+description similarity if that is higher.
+    """
+    title_similarity = jaccard_similarity(word_set(task.get('title', '')), word_set(candidate['title'] or ''))
+    full_similarity = jaccard_similarity(
+        word_set(f"{task.get('title', '')} {task.get('description', '')}"),
+        word_set(f"{candidate['title'] or ''} {candidate['description'] or ''}")
+    )
+    return max(title_similarity, full_similarity)
+
+
+class SeriesLinker:
+    """
+    Links tasks from successive meetings of a recurring series.
+
+    Keeps the open tasks of each series in the task store's database with an
+    inverted token index per owner. New tasks are matched against open tasks
+    with the same owner that share at least one indexed token. Open tasks
+    that stop coming up are aged out (status 'stale').
+    """
+
+    def __init__(self, store: TaskStore):
+        self.store = store
+        conn = store._connect()
+        conn.executescript(LINEAGE_SCHEMA)
+        store._migrate(conn, LINEAGE_MIGRATIONS)
+        conn.commit()
+
+    def link_tasks(self, series_id: str, meeting_id: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Label each task as new, carried_over, updated or completed.
+
+        Linking is idempotent per (series, meeting): linking the same meeting
+        again returns the labels recorded the first time. If the meeting was
+        re-analyzed since (its tasks no longer match the links), the old links
+        are undone and the new tasks are linked afresh.
+
+        Args:
+            series_id (str): Meeting series identifier
+            meeting_id (str): Meeting id (transcript content hash)
+            tasks: Planned tasks for the meeting, in stored order
+
+        Returns:
+            Tasks with a 'lineage' entry
+        """
+        with stage_timer('lineage'):
+            conn = self.store._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._link_rows(series_id, meeting_id)
+                if rows and not self._links_match(rows, tasks):
+                    self._unlink_meeting(series_id, meeting_id)
+                    rows = []
+                if rows:
+                    links = {row['position']: self._lineage(row) for row in rows}
+                else:
+                    links = self._link_new_meeting(series_id, meeting_id, tasks)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        linked_tasks = []
+        for position, task in enumerate(tasks):
+            linked_task = task.copy()
+            linked_task['lineage'] = links.get(position)
+            linked_tasks.append(linked_task)
+        return linked_tasks
+
+    def open_tasks(self, series_id: str, owner: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        List open tasks tracked for a series, optionally for one owner.
+        """
+        query = 'SELECT * FROM series_tasks WHERE series_id = ? AND status = ?'
+        params: List[Any] = [series_id, 'open']
+        if owner:
+            query += ' AND owner_norm = ?'
+            params.append(normalize_owner(owner))
+        query += ' ORDER BY series_task_id LIMIT ?'
+        params.append(limit)
+        return [dict(row) for row in self.store._connect().execute(query, params).fetchall()]
+
+    def sync_task_status(self, task_id: int, status: str) -> int:
+        """
+        Apply a stored task's status change (PATCH /tasks/<id>) to the series
+        tasks it is linked to. Done and cancelled tasks leave the match index;
+        reopened tasks are indexed again and count as seen now. Links left
+        over from before the meeting was re-analyzed are ignored.
+
+        Returns:
+            int: Number of series tasks updated
+        """
+        series_status = SERIES_STATUS_FOR_TASK[status]
+        conn = self.store._connect()
+        now = datetime.now().isoformat()
+        with conn:
+            rows = conn.execute(
+                """
+                SELECT t.*, COALESCE(s.meeting_count, 0) AS meeting_count, l.title AS link_title,
+                       k.title AS task_title
+                FROM tasks k
+                JOIN series_links l ON l.meeting_id = k.meeting_id AND l.position = k.position
+                JOIN series_tasks t ON t.series_task_id = l.series_task_id
+                LEFT JOIN series s ON s.series_id = t.series_id
+                WHERE k.task_id = ?
+                """,
+                (task_id,)
+            ).fetchall()
+            rows = [row for row in rows
+                    if row['link_title'] is None or row['link_title'] == normalize_title(row['task_title'])]
+            for row in rows:
+                conn.execute(
+                    'UPDATE series_tasks SET status = ?, last_seen_seq = ?, updated_at = ? WHERE series_task_id = ?',
+                    (series_status, row['meeting_count'] if series_status == 'open' else row['last_seen_seq'],
+                     now, row['series_task_id'])
+                )
+                conn.execute('DELETE FROM series_tokens WHERE series_task_id = ?', (row['series_task_id'],))
+                if series_status == 'open':
+                    self._index_series_task(row['series_id'], row['owner_norm'], row['series_task_id'],
+                                            index_tokens(dict(row)))
+        return len(rows)
+
+    def age_tasks(self, series_id: str, meeting_seq: int, now: datetime = None) -> int:
+        """
+        Mark open series tasks stale once they have not come up in
+        STALE_AFTER_MEETINGS meetings or STALE_AFTER_DAYS days, and drop them
+        from the match index. Runs inside the caller's transaction.
+
+        Returns:
+            int: Number of tasks aged out
+        """
+        now = now or datetime.now()
+        cutoff = (now - timedelta(days=STALE_AFTER_DAYS)).isoformat()
+        conn = self.store._connect()
+        stale_ids = [row[0] for row in conn.execute(
+            """
+            SELECT series_task_id FROM series_tasks
+            WHERE series_id = ? AND status = 'open' AND (last_seen_seq <= ? OR updated_at < ?)
+            """,
+            (series_id, meeting_seq - STALE_AFTER_MEETINGS, cutoff)
+        ).fetchall()]
+        conn.executemany("UPDATE series_tasks SET status = 'stale', updated_at = ? WHERE series_task_id = ?",
+                         [(now.isoformat(), series_task_id) for series_task_id in stale_ids])
+        conn.executemany('DELETE FROM series_tokens WHERE series_task_id = ?',
+                         [(series_task_id,) for series_task_id in stale_ids])
+        if stale_ids:
+            SERIES_TASKS_AGED.inc(len(stale_ids))
+        return len(stale_ids)
+
+    def _next_meeting_seq(self, series_id: str, now: str) -> int:
+        conn = self.store._connect()
+        conn.execute(
+            """
+            INSERT INTO series (series_id, meeting_count, updated_at) VALUES (?, 1, ?)
+            ON CONFLICT (series_id) DO UPDATE SET meeting_count = meeting_count + 1, updated_at = excluded.updated_at
+            """,
+            (series_id, now)
+        )
+        return conn.execute('SELECT meeting_count FROM series WHERE series_id = ?', (series_id,)).fetchone()[0]
+
+    def _link_rows(self, series_id: str, meeting_id: str) -> List[Any]:
+        return self.store._connect().execute(
+            """
+            SELECT l.position, l.status, l.series_task_id, l.similarity, l.title, t.first_meeting_id,
+                   t.occurrences
+            FROM series_links l JOIN series_tasks t ON t.series_task_id = l.series_task_id
+            WHERE l.series_id = ? AND l.meeting_id = ?
+            """,
+            (series_id, meeting_id)
+        ).fetchall()
+
+    @staticmethod
+    def _links_match(rows: List[Any], tasks: List[Dict[str, Any]]) -> bool:
+        # Links from before the title column was added cannot be checked
+        titles = {row['position']: row['title'] for row in rows}
+        return set(titles) == set(range(len(tasks))) and all(
+            titles[position] is None or titles[position] == normalize_title(task.get('title'))
+            for position, task in enumerate(tasks))
+
+    def _unlink_meeting(self, series_id: str, meeting_id: str) -> None:
+        """
+        Undo a meeting's links so its re-analyzed tasks can be linked again:
+        series tasks it introduced are dropped, occurrences it added are
+        removed and tasks it completed are reopened. Runs inside the caller's
+        transaction.
+        """
+        conn = self.store._connect()
+        now = datetime.now().isoformat()
+        rows = conn.execute(
+            """
+            SELECT l.status AS link_status, t.*
+            FROM series_links l JOIN series_tasks t ON t.series_task_id = l.series_task_id
+            WHERE l.series_id = ? AND l.meeting_id = ?
+            """,
+            (series_id, meeting_id)
+        ).fetchall()
+        for row in rows:
+            series_task_id = row['series_task_id']
+            if row['link_status'] == 'new' and row['occurrences'] <= 1:
+                conn.execute('DELETE FROM series_tokens WHERE series_task_id = ?', (series_task_id,))
+                conn.execute('DELETE FROM series_tasks WHERE series_task_id = ?', (series_task_id,))
+                continue
+            reopen = (row['link_status'] == 'completed' and row['status'] == 'done'
+                      and row['last_meeting_id'] == meeting_id)
+            conn.execute(
+                """
+                UPDATE series_tasks SET occurrences = MAX(occurrences - 1, 1), status = ?, updated_at = ?
+                WHERE series_task_id = ?
+                """,
+                ('open' if reopen else row['status'], now, series_task_id)
+            )
+            if reopen:
+                conn.execute('DELETE FROM series_tokens WHERE series_task_id = ?', (series_task_id,))
+                self._index_series_task(series_id, row['owner_norm'], series_task_id, index_tokens(dict(row)))
+        conn.execute('DELETE FROM series_links WHERE series_id = ? AND meeting_id = ?', (series_id, meeting_id))
+        conn.execute('UPDATE series SET meeting_count = MAX(meeting_count - 1, 0) WHERE series_id = ?',
+                     (series_id,))
+
+    def _link_new_meeting(self, series_id: str, meeting_id: str,
+                          tasks: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        conn = self.store._connect()
+        now = datetime.now().isoformat()
+        meeting_seq = self._next_meeting_seq(series_id, now)
+        claimed: Set[int] = set()
+
+        for position, task in enumerate(tasks):
+            owner_norm = normalize_owner(task.get('owner'))
+            tokens = index_tokens(task)
+            match, similarity = self._best_match(series_id, owner_norm, tokens, task, claimed)
+
+            if match is None:
+                status = 'new'
+                series_task_id = self._insert_series_task(series_id, meeting_id, owner_norm, task, tokens,
+                                                          meeting_seq, now)
+            else:
+                series_task_id = match['series_task_id']
+                status = self._classify(task, match)
+                self._update_series_task(series_id, meeting_id, owner_norm, series_task_id, task, tokens,
+                                         status, meeting_seq, now)
+            # Each series task is matched at most once per meeting
+            claimed.add(series_task_id)
+
+            conn.execute(
+                """
+                INSERT INTO series_links (series_id, meeting_id, position, status, series_task_id, similarity,
+                                          title, linked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (series_id, meeting_id, position, status, series_task_id,
+                 round(similarity, 3) if match is not None else None, normalize_title(task.get('title')), now)
+            )
+            LINEAGE_LABELS.inc(status=status)
+
+        self.age_tasks(series_id, meeting_seq)
+        return {row['position']: self._lineage(row) for row in self._link_rows(series_id, meeting_id)}
+
+    def _best_match(self, series_id: str, owner_norm: str, tokens: Set[str], task: Dict[str, Any],
+                    claimed: Set[int]):
+        if not tokens:
+            return None, 0.0
+
+        conn = self.store._connect()
+        placeholders = ','.join('?' * len(tokens))
+        candidate_ids = [row[0] for row in conn.execute(
+            f"""
+            SELECT DISTINCT series_task_id FROM series_tokens
+            WHERE series_id = ? AND owner_norm = ? AND token IN ({placeholders})
+            """,
+            [series_id, owner_norm, *tokens]
+        ).fetchall() if row[0] not in claimed]
+        if not candidate_ids:
+            return None, 0.0
+
+        placeholders = ','.join('?' * len(candidate_ids))
+        candidates = conn.execute(
+            f"SELECT * FROM series_tasks WHERE series_task_id IN ({placeholders}) AND status = 'open'",
+            candidate_ids
+        ).fetchall()
+
+        best, best_similarity = None, 0.0
+        for candidate in candidates:
+            similarity = task_similarity(task, candidate)
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+
+        if best_similarity <= MATCH_THRESHOLD:
+            return None, best_similarity
+        return best, best_similarity
+
+    @staticmethod
+    def _classify(task: Dict[str, Any], match: Dict[str, Any]) -> str:
+        # Titles and descriptions restate the goal ("make sure X is done"), so
+        # only an explicit status or the quoted evidence can mark completion
+        if task.get('status') == 'done' or reports_completion(task.get('evidence', '')):
+            return 'completed'
+
+        deadline_changed = (task.get('deadline', 'TBD') or 'TBD').strip().lower() != \
+            (match['deadline'] or 'TBD').strip().lower()
+        priority_changed = normalize_priority(task.get('priority')) != match['priority']
+        description_similarity = jaccard_similarity(word_set(task.get('description', '')),
+                                                    word_set(match['description'] or ''))
+        if deadline_changed or priority_changed or description_similarity < UPDATED_DESCRIPTION_THRESHOLD:
+            return 'updated'
+        return 'carried_over'
+
+    def _insert_series_task(self, series_id: str, meeting_id: str, owner_norm: str, task: Dict[str, Any],
+                            tokens: Set[str], meeting_seq: int, now: str) -> int:
+        conn = self.store._connect()
+        status = SERIES_STATUS_FOR_TASK.get(task.get('status'), 'open')
+        cursor = conn.execute(
+            """
+            INSERT INTO series_tasks (series_id, owner_norm, title, description, deadline, priority, status,
+                                      first_meeting_id, last_meeting_id, last_seen_seq, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (series_id, owner_norm, task.get('title', ''), task.get('description', ''),
+             task.get('deadline', 'TBD'), normalize_priority(task.get('priority')), status, meeting_id, meeting_id,
+             meeting_seq, now)
+        )
+        series_task_id = cursor.lastrowid
+        if status == 'open':
+            self._index_series_task(series_id, owner_norm, series_task_id, tokens)
+        return series_task_id
+
+    def _index_series_task(self, series_id: str, owner_norm: str, series_task_id: int, tokens: Set[str]) -> None:
+        self.store._connect().executemany(
+            'INSERT INTO series_tokens (series_id, owner_norm, token, series_task_id) VALUES (?, ?, ?, ?)',
+            [(series_id, owner_norm, token, series_task_id) for token in tokens]
+        )
+
+    def _update_series_task(self, series_id: str, meeting_id: str, owner_norm: str, series_task_id: int,
+                            task: Dict[str, Any], tokens: Set[str], status: str, meeting_seq: int,
+                            now: str) -> None:
+        conn = self.store._connect()
+        conn.execute(
+            """
+            UPDATE series_tasks
+            SET title = ?, description = ?, deadline = ?, priority = ?, status = ?,
+                last_meeting_id = ?, occurrences = occurrences + 1, last_seen_seq = ?, updated_at = ?
+            WHERE series_task_id = ?
+            """,
+            (task.get('title', ''), task.get('description', ''), task.get('deadline', 'TBD'),
+             normalize_priority(task.get('priority')), 'done' if status == 'completed' else 'open',
+             meeting_id, meeting_seq, now, series_task_id)
+        )
+        # Re-index with the latest wording, or drop from the index once done
+        conn.execute('DELETE FROM series_tokens WHERE series_task_id = ?', (series_task_id,))
+        if status != 'completed':
+            self._index_series_task(series_id, owner_norm, series_task_id, tokens)
+
+    @staticmethod
+    def _lineage(row) -> Dict[str, Any]:
+        return {
+            "status": row['status'],
+            "series_task_id": row['series_task_id'],
+            "first_meeting_id": row['first_meeting_id'],
+            "occurrences": row['occurrences'],
+            "similarity": row['similarity']
+        }
+
+
+def summarize_lineage(tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count tasks per lineage status.
+    """
+    counts = {status: 0 for status in LINEAGE_STATUSES}
+    for task in tasks:
+        lineage = task.get('lineage')
+        if lineage:
+            counts[lineage['status']] += 1
+    return counts
+
+
+_linker = None
+_linker_lock = threading.Lock()
+
+
+def get_linker() -> SeriesLinker:
+    """
+    Return the process-wide series linker, backed by the shared task store.
+    """
+    global _linker
+    if _linker is None:
+        with _linker_lock:
+            if _linker is None:
+                _linker = SeriesLinker(get_store())
+    return _linker
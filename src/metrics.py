@@ -0,0 +1,290 @@
+# src/metrics.py
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Metrics are kept in memory per process. With several gunicorn workers a
+# scrape reaches one arbitrary worker, so each worker also writes a snapshot
+# of its values to a shared directory (see enable_multiprocess) and /metrics
+# renders the sum over every worker's snapshot.
+SNAPSHOT_INTERVAL = float(os.getenv('METRICS_SNAPSHOT_INTERVAL', '1'))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 15, 20, 30, 50, 100)
+
+_lock = threading.Lock()
+_request_local = threading.local()
+_multiprocess_dir: Optional[str] = None
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+    """
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    @staticmethod
+    def merge(merged: Dict[Tuple, Any], key: Tuple, value: float, pid: int) -> None:
+        """
+        Add one worker's value for a label set into the merged values.
+        """
+        merged[key] = merged.get(key, 0) + value
+
+    def render(self, values: Dict[Tuple, Any]) -> list:
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in values.items()]
+
+
+class Gauge(Counter):
+    """
+    Gauge holding the last value set.
+    """
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            self.values[key] = value
+
+    @staticmethod
+    def merge(merged: Dict[Tuple, Any], key: Tuple, value: float, pid: int) -> None:
+        """
+        Gauges are not summed: each worker's value is kept under a pid label.
+        """
+        merged[tuple(sorted(key + (('pid', pid),)))] = value
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with optional labels.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.values: Dict[Tuple, Dict[str, Any]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            series = self.values.get(key)
+            if series is None:
+                series = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self.values[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    @staticmethod
+    def merge(merged: Dict[Tuple, Any], key: Tuple, value: Dict[str, Any], pid: int) -> None:
+        """
+        Add one worker's bucket counts, sum and count into the merged values.
+        """
+        series = merged.get(key)
+        if series is None:
+            merged[key] = {'counts': list(value['counts']), 'sum': value['sum'], 'count': value['count']}
+            return
+        series['counts'] = [a + b for a, b in zip(series['counts'], value['counts'])]
+        series['sum'] += value['sum']
+        series['count'] += value['count']
+
+    def render(self, values: Dict[Tuple, Any]) -> list:
+        lines = []
+        for key, series in values.items():
+            for bound, count in zip(self.buckets, series['counts']):
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {series['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+def _format_labels(key: Tuple) -> str:
+    if not key:
+        return ''
+    pairs = ','.join(f'{name}="{str(value)}"' for name, value in key)
+    return '{' + pairs + '}'
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+STAGE_SECONDS = Histogram('meeting_agent_stage_seconds', 'Time spent in each pipeline stage')
+STAGE_ERRORS = Counter('meeting_agent_stage_errors_total', 'Exceptions raised inside a pipeline stage')
+TRANSCRIPT_CHARS = Histogram('meeting_agent_transcript_chars', 'Size of processed transcripts in characters',
+                             SIZE_BUCKETS)
+TOKENS = Histogram('meeting_agent_gemini_tokens', 'Gemini token usage per call (direction=input|output)',
+                   SIZE_BUCKETS)
+TASKS_EXTRACTED = Histogram('meeting_agent_tasks_per_meeting', 'Number of tasks per meeting at each stage',
+                            COUNT_BUCKETS)
+PARSE_FAILURES = Counter('meeting_agent_parse_failures_total', 'Gemini responses that were not valid JSON')
+GEMINI_RETRIES = Counter('meeting_agent_gemini_retries_total', 'Retried Gemini API calls')
+GEMINI_ERRORS = Counter('meeting_agent_gemini_errors_total', 'Gemini API calls that failed after all retries')
+HTTP_REQUESTS = Counter('meeting_agent_http_requests_total', 'HTTP requests by endpoint and status code')
+CASCADE_ROUTES = Counter('meeting_agent_cascade_routes_total',
+                         'Model cascade routing decisions by initial model, escalation reason and outcome')
+PACKED_MEETINGS = Counter('meeting_agent_packed_meetings_total',
+                          'Meetings analyzed via packed requests (outcome=packed|fallback|single)')
+EVIDENCE_ANCHORS = Counter('meeting_agent_evidence_anchors_total',
+                           'Task evidence quotes by match type (exact|fuzzy|unanchored)')
+LINEAGE_LABELS = Counter('meeting_agent_lineage_labels_total',
+                         'Series-linked tasks by lineage status (new|carried_over|updated|completed)')
+SERIES_TASKS_AGED = Counter('meeting_agent_series_tasks_aged_total',
+                            'Open series tasks marked stale after not coming up for too long')
+COLD_START_MS = Gauge('meeting_agent_cold_start_ms', 'Milliseconds spent importing modules at worker boot')
+
+REGISTRY = [STAGE_SECONDS, STAGE_ERRORS, TRANSCRIPT_CHARS, TOKENS, TASKS_EXTRACTED,
+            PARSE_FAILURES, GEMINI_RETRIES, GEMINI_ERRORS, HTTP_REQUESTS, CASCADE_ROUTES,
+            PACKED_MEETINGS, EVIDENCE_ANCHORS, LINEAGE_LABELS, SERIES_TASKS_AGED,
+            COLD_START_MS]
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Time a pipeline stage. Usable as a context manager or a decorator.
+
+    Records into the stage histogram and, when a request breakdown is active on
+    this thread, into the per-request timings.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = getattr(_request_local, 'timings', None)
+        if timings is not None:
+            timings[stage] = round(timings.get(stage, 0.0) + elapsed * 1000, 2)
+
+
+def start_request_timings() -> None:
+    """
+    Start collecting a per-request stage breakdown on the current thread.
+    """
+    _request_local.timings = {}
+
+
+def pop_request_timings() -> Optional[Dict[str, float]]:
+    """
+    Return the per-request stage breakdown (in ms) and stop collecting.
+    """
+    timings = getattr(_request_local, 'timings', None)
+    _request_local.timings = None
+    return timings
+
+
+def enable_multiprocess(directory: str) -> None:
+    """
+    Share this process's metrics with sibling workers through a directory.
+
+    Call once per worker after fork. The worker writes a snapshot of its values
+    to <directory>/<pid>.json every SNAPSHOT_INTERVAL seconds (and on every
+    render), and render_prometheus() then reports the sum over all snapshots.
+    Snapshots of exited workers are kept so counters never go backwards;
+    their gauges are dropped.
+    """
+    global _multiprocess_dir
+    os.makedirs(directory, exist_ok=True)
+    _multiprocess_dir = directory
+    write_snapshot()
+    threading.Thread(target=_snapshot_loop, name='metrics-snapshot', daemon=True).start()
+
+
+def write_snapshot() -> None:
+    """
+    Atomically write this process's current metric values to the shared directory.
+    """
+    if _multiprocess_dir is None:
+        return
+    with _lock:
+        snapshot = {metric.name: [[list(key), value] for key, value in metric.values.items()]
+                    for metric in REGISTRY}
+        payload = json.dumps(snapshot)
+    path = os.path.join(_multiprocess_dir, f'{os.getpid()}.json')
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _snapshot_loop() -> None:
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        try:
+            write_snapshot()
+        except OSError:
+            logger.warning("Could not write metrics snapshot", exc_info=True)
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merged_values() -> Dict[str, Dict[Tuple, Any]]:
+    """
+    Metric values summed over the snapshots of every worker.
+    """
+    write_snapshot()
+    merged: Dict[str, Dict[Tuple, Any]] = {metric.name: {} for metric in REGISTRY}
+    for path in glob.glob(os.path.join(_multiprocess_dir, '*.json')):
+        try:
+            pid = int(os.path.basename(path)[:-len('.json')])
+            with open(path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        running = _pid_running(pid)
+        for metric in REGISTRY:
+            if metric.kind == 'gauge' and not running:
+                continue
+            for key, value in snapshot.get(metric.name, []):
+                metric.merge(merged[metric.name], tuple(tuple(pair) for pair in key), value, pid)
+    return merged
+
+
+def render_prometheus() -> str:
+    """
+    Render all metrics in the Prometheus text exposition format.
+    """
+    merged = _merged_values() if _multiprocess_dir is not None else None
+    lines = []
+    with _lock:
+        for metric in REGISTRY:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render(merged[metric.name] if merged is not None else metric.values))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,180 @@
+# src/packing.py
+import json
+import logging
+import os
+from typing import List, Dict, Any, Tuple
+
+from .gemini_client import generate_json, TASK_EXTRACTION_PROMPT, DEFAULT_MODEL
+from .understand import analyze_meeting
+from .metrics import stage_timer, PACKED_MEETINGS
+
+logger = logging.getLogger(__name__)
+
+# Budget for the transcripts in one packed request. The system prompt is
+# sent once per pack, which is where the savings come from.
+PACK_TOKEN_BUDGET = int(os.getenv('PACK_TOKEN_BUDGET', '6000'))
+MAX_MEETINGS_PER_PACK = int(os.getenv('PACK_MAX_MEETINGS', '8'))
+
+PACKED_PROMPT = TASK_EXTRACTION_PROMPT + """
+        MULTIPLE MEETINGS: The input contains several independent meetings, each
+        wrapped in <meeting id="..."> tags. Analyze each meeting separately and
+        never mix tasks, decisions or participants between meetings.
+
+        Return ONLY valid JSON keyed by meeting id, where each value uses the
+        JSON Format above:
+        {
+            "meetings": {
+                "<meeting id>": { "tasks": [...], "meeting_summary": "...", "decisions": [...], "participants": [...] }
+            }
+        }
+        Include every meeting id from the input exactly once.
+        """
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token estimate (~4 characters per token for English text).
+    """
+    return len(text) // 4 + 1
+
+def pack_transcripts(transcripts: Dict[str, str], token_budget: int = PACK_TOKEN_BUDGET,
+                     max_meetings: int = MAX_MEETINGS_PER_PACK) -> List[List[str]]:
+    """
+    Bin transcripts into packs using first-fit decreasing by estimated tokens.
+
+    Transcripts larger than the budget get a pack of their own.
+
+    Args:
+        transcripts: Mapping of meeting id to processed transcript
+        token_budget (int): Maximum estimated transcript tokens per pack
+        max_meetings (int): Maximum meetings per pack
+
+    Returns:
+        List[List[str]]: Meeting ids grouped into packs
+    """
+    sizes = {meeting_id: estimate_tokens(text) for meeting_id, text in transcripts.items()}
+    packs: List[List[str]] = []
+    pack_sizes: List[int] = []
+
+    for meeting_id in sorted(sizes, key=lambda mid: sizes[mid], reverse=True):
+        size = sizes[meeting_id]
+        for i, pack in enumerate(packs):
+            if len(pack) < max_meetings and pack_sizes[i] + size <= token_budget:
+                pack.append(meeting_id)
+                pack_sizes[i] += size
+                break
+        else:
+            packs.append([meeting_id])
+            pack_sizes.append(size)
+
+    return packs
+
+def build_packed_prompt(transcripts: Dict[str, str], pack: List[str]) -> Tuple[str, Dict[str, str]]:
+    """
+    Build the user prompt for one pack.
+
+    Meetings are labelled m1, m2, ... in the prompt so the model does not have
+    to echo arbitrary ids (file names, hashes) back exactly.
+
+    Returns:
+        Tuple of (user prompt, mapping of prompt label to meeting id)
+    """
+    labels = {f"m{i}": meeting_id for i, meeting_id in enumerate(pack, 1)}
+    sections = [f'<meeting id="{label}">\n{transcripts[meeting_id]}\n</meeting>'
+                for label, meeting_id in labels.items()]
+    user_prompt = ("MEETING TRANSCRIPTS:\n\n" + "\n\n".join(sections) +
+                   "\n\nExtract all actionable tasks and meeting outcomes for each meeting.")
+    return user_prompt, labels
+
+def split_packed_response(parsed: Any, labels: Dict[str, str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Split a packed response back into per-meeting results.
+
+    Args:
+        parsed: Parsed JSON response for a pack
+        labels: Mapping of prompt label to meeting id
+
+    Returns:
+        Tuple of (results by meeting id, meeting ids whose entry was missing or malformed)
+    """
+    meetings = parsed.get('meetings') if isinstance(parsed, dict) else None
+    if not isinstance(meetings, dict):
+        return {}, list(labels.values())
+
+    results = {}
+    failed = []
+    for label, meeting_id in labels.items():
+        entry = meetings.get(label)
+        if _is_valid_result(entry):
+            results[meeting_id] = entry
+        else:
+            failed.append(meeting_id)
+    return results, failed
+
+def _is_valid_result(entry: Any) -> bool:
+    """
+    Check that a per-meeting entry has the single-meeting result shape.
+    """
+    if not isinstance(entry, dict) or not isinstance(entry.get('tasks'), list):
+        return False
+    return all(isinstance(task, dict) and task.get('title') for task in entry['tasks'])
+
+def analyze_meetings_packed(transcripts: Dict[str, str], token_budget: int = PACK_TOKEN_BUDGET,
+                            max_meetings: int = MAX_MEETINGS_PER_PACK,
+                            model_name: str = DEFAULT_MODEL, api_key: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze many small meetings with as few model round-trips as possible.
+
+    Meetings whose packed result is missing or malformed (or whose whole pack
+    failed) are re-analyzed individually with analyze_meeting.
+
+    Args:
+        transcripts: Mapping of meeting id to processed transcript
+        token_budget (int): Maximum estimated transcript tokens per pack
+        max_meetings (int): Maximum meetings per pack
+        model_name (str): Gemini model for packed requests
+        api_key (str): Google AI Studio API key
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Raw analysis results by meeting id, in the
+        same shape as analyze_meeting output
+    """
+    from .gemini_client import setup_gemini
+    setup_gemini(api_key)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    fallback: List[str] = []
+
+    for pack in pack_transcripts(transcripts, token_budget, max_meetings):
+        if len(pack) == 1:
+            # Nothing to share the prompt with; analyze it on its own
+            PACKED_MEETINGS.inc(outcome='single')
+            fallback.extend(pack)
+            continue
+
+        user_prompt, labels = build_packed_prompt(transcripts, pack)
+        try:
+            with stage_timer('understand_packed'):
+                parsed = generate_json(PACKED_PROMPT, user_prompt, model_name=model_name)
+            pack_results, failed = split_packed_response(parsed, labels)
+        except json.JSONDecodeError as e:
+            logger.warning("Packed response for %d meetings was not valid JSON: %s", len(pack), e)
+            pack_results, failed = {}, list(pack)
+        except Exception as e:
+            logger.warning("Packed request for %d meetings failed: %s", len(pack), e)
+            pack_results, failed = {}, list(pack)
+
+        for meeting_id, result in pack_results.items():
+            result['packed'] = True
+            result['model'] = model_name
+            results[meeting_id] = result
+        PACKED_MEETINGS.inc(len(pack_results), outcome='packed')
+
+        if failed:
+            logger.info("Falling back to individual calls for %d of %d packed meetings", len(failed), len(pack))
+            PACKED_MEETINGS.inc(len(failed), outcome='fallback')
+        fallback.extend(failed)
+
+    for meeting_id in fallback:
+        results[meeting_id] = analyze_meeting(transcripts[meeting_id], api_key=api_key)
+
+    return results
@@ -0,0 +1,104 @@
+# src/pipeline.py
+# Serving-path pipeline. Only imports the modules needed to analyze a
+# transcript; evaluation and plotting dependencies (pandas, matplotlib,
+# scikit-learn) must never be imported from here.
+import logging
+from typing import Dict, Any
+
+from .understand import analyze_meeting
+from .validate import validate_tasks, deduplicate_tasks
+from .planner import plan_tasks
+from .evidence import anchor_tasks
+from .gemini_client import DEFAULT_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Bump when pipeline changes should invalidate stored analyses and batch outputs
+PIPELINE_VERSION = '1'
+
+def run_pipeline(transcript: str) -> Dict[str, Any]:
+    """
+    Run understand -> validate -> deduplicate -> plan on a processed transcript.
+
+    Args:
+        transcript (str): Processed transcript text
+
+    Returns:
+        Dict[str, Any]: Analysis results with planned tasks
+    """
+    analysis_results = analyze_meeting(transcript)
+    return finalize_analysis(analysis_results, transcript)
+
+def finalize_analysis(analysis_results: Dict[str, Any], transcript: str = None) -> Dict[str, Any]:
+    """
+    Run the validate/deduplicate/plan stages on raw extraction results.
+
+    Args:
+        analysis_results: Output of the understand stage
+        transcript (str): Source transcript; when given, evidence quotes are
+            anchored to it and unanchored tasks lose confidence
+
+    Returns:
+        Dict[str, Any]: Analysis results with planned tasks, tagged with the
+        model that produced them and the pipeline version
+    """
+    tasks = analysis_results.get('tasks', [])
+    participants = analysis_results.get('participants', [])
+
+    validated_tasks = validate_tasks(tasks, participants)
+    if transcript is not None:
+        validated_tasks = anchor_tasks(validated_tasks, transcript)
+    deduplicated_tasks = deduplicate_tasks(validated_tasks)
+    planned_tasks = plan_tasks(deduplicated_tasks)
+
+    routing = analysis_results.get('routing') or {}
+    results = {
+        "tasks": planned_tasks,
+        "meeting_summary": analysis_results.get('meeting_summary', ''),
+        "decisions": analysis_results.get('decisions', []),
+        "participants": participants,
+        "total_tasks": len(planned_tasks),
+        "model": routing.get('final_model') or analysis_results.get('model', DEFAULT_MODEL),
+        "pipeline_version": PIPELINE_VERSION
+    }
+    for key in ('routing', 'extraction_error'):
+        if key in analysis_results:
+            results[key] = analysis_results[key]
+    return results
+
+def run_packed_pipeline(transcripts: Dict[str, str], **packing_options) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the pipeline over many small transcripts using packed model requests.
+
+    Args:
+        transcripts: Mapping of meeting id to processed transcript
+        **packing_options: Passed to packing.analyze_meetings_packed
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Analysis results with planned tasks, by meeting id
+    """
+    from .packing import analyze_meetings_packed
+
+    raw_results = analyze_meetings_packed(transcripts, **packing_options)
+    return {meeting_id: finalize_analysis(analysis, transcripts[meeting_id])
+            for meeting_id, analysis in raw_results.items()}
+
+def warmup() -> None:
+    """
+    Initialise the Gemini client and task store so the first request does not
+    pay for it. Call once per worker process (after fork).
+    """
+    from .gemini_client import setup_gemini, get_model
+    from .store import get_store
+    from .router import cascade_enabled, FAST_MODEL, STRONG_MODEL
+
+    try:
+        setup_gemini()
+        get_model()
+        if cascade_enabled():
+            get_model(FAST_MODEL)
+            get_model(STRONG_MODEL)
+    except ValueError as e:
+        # Missing API key: let requests surface the error instead of failing boot
+        logger.warning("Gemini warmup skipped: %s", e)
+    get_store()
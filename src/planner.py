@@ -1,5 +1,6 @@
 # src/planner.py
 from typing import List, Dict, Any
+from .metrics import stage_timer
 
 def generate_execution_steps(task: Dict[str, Any]) -> List[str]:
     """
@@ -44,6 +45,7 @@ def generate_execution_steps(task: Dict[str, Any]) -> List[str]:
             "Deliver outcomes"
         ]
 
+@stage_timer('plan')
 def plan_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Add execution plans to all tasks.
@@ -0,0 +1,161 @@
+# src/router.py
+import logging
+import os
+from typing import List, Dict, Any, Optional, Tuple
+
+from .gemini_client import extract_tasks_from_transcript, DEFAULT_MODEL
+from .validate import check_tasks
+from .metrics import CASCADE_ROUTES
+from .text_utils import speaker_turns, as_float
+
+logger = logging.getLogger(__name__)
+
+# Cheap model tried first for short/simple transcripts. The strong model is
+# the one the pipeline always used, so an escalated result is never worse
+# than the original single-model behaviour.
+FAST_MODEL = os.getenv('CASCADE_FAST_MODEL', 'gemini-2.5-flash-lite')
+STRONG_MODEL = os.getenv('CASCADE_STRONG_MODEL', DEFAULT_MODEL)
+
+SHORT_TRANSCRIPT_WORDS = int(os.getenv('CASCADE_SHORT_TRANSCRIPT_WORDS', '1500'))
+MAX_SIMPLE_SPEAKERS = int(os.getenv('CASCADE_MAX_SIMPLE_SPEAKERS', '6'))
+MIN_MEAN_CONFIDENCE = float(os.getenv('CASCADE_MIN_MEAN_CONFIDENCE', '0.6'))
+MAX_INVALID_OWNER_RATIO = float(os.getenv('CASCADE_MAX_INVALID_OWNER_RATIO', '0.3'))
+
+def cascade_enabled() -> bool:
+    """
+    Whether model routing is on (CASCADE_ENABLED, default off).
+
+    Off by default until the cascade's F1 against the strong model alone has
+    been measured on the labelled set (see README, Model Cascade).
+    """
+    return os.getenv('CASCADE_ENABLED', '0').lower() in ('1', 'true', 'yes')
+
+def count_speakers(transcript: str) -> int:
+    """
+    Count distinct 'Name:' speaker labels in a transcript.
+    """
+    return len(set(name.lower() for _, name in speaker_turns(transcript)))
+
+def choose_initial_model(transcript: str) -> Tuple[str, str]:
+    """
+    Pick the first model to try based on transcript size and speaker count.
+
+    Returns:
+        Tuple of (model_name, reason)
+    """
+    words = len(transcript.split())
+    if words > SHORT_TRANSCRIPT_WORDS:
+        return STRONG_MODEL, 'long_transcript'
+    if count_speakers(transcript) > MAX_SIMPLE_SPEAKERS:
+        return STRONG_MODEL, 'many_speakers'
+    return FAST_MODEL, 'short_transcript'
+
+def assess_extraction(results: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Decide whether an extraction is good enough to accept.
+
+    Args:
+        results: Output of extract_tasks_from_transcript
+
+    Returns:
+        Tuple of (escalation reason or None if acceptable, quality stats)
+    """
+    tasks = results.get('tasks', [])
+    stats = {"task_count": len(tasks) if isinstance(tasks, list) else 0}
+
+    if results.get('extraction_error'):
+        return 'extraction_failed', stats
+    if not isinstance(tasks, list) or any(not isinstance(task, dict) or not task.get('title') for task in tasks):
+        return 'malformed_tasks', stats
+    if not tasks and not results.get('meeting_summary'):
+        return 'empty_result', stats
+    if not tasks:
+        return None, stats
+
+    validated = check_tasks(tasks, results.get('participants', []))
+    confidences = [as_float(task.get('confidence')) for task in validated]
+    mean_confidence = sum(confidences) / len(confidences)
+    # 'TBD' owners are a legitimate answer, so only named owners that do not
+    # match any participant count as suspicious.
+    invalid_owners = sum(1 for task in validated
+                         if task.get('owner', 'TBD') != 'TBD' and not task.get('owner_valid'))
+    invalid_owner_ratio = invalid_owners / len(validated)
+
+    stats.update({
+        "mean_confidence": round(mean_confidence, 3),
+        "invalid_owner_ratio": round(invalid_owner_ratio, 3)
+    })
+
+    if mean_confidence < MIN_MEAN_CONFIDENCE:
+        return 'low_confidence', stats
+    if invalid_owner_ratio > MAX_INVALID_OWNER_RATIO:
+        return 'invalid_owners', stats
+    return None, stats
+
+def extract_with_cascade(transcript: str) -> Dict[str, Any]:
+    """
+    Extract tasks, trying a cheaper model first and escalating when needed.
+
+    Args:
+        transcript (str): The meeting transcript
+
+    Returns:
+        Dict[str, Any]: Extraction results with a 'routing' entry describing
+        which models were used and why. 'final_model' is the model whose
+        result is returned; 'outcome' is 'accepted' (first model's result
+        kept), 'escalated' (strong model's result used) or 'strong_failed'
+        (escalation was attempted but the strong model errored, so the first
+        model's result is kept)
+    """
+    initial_model, route_reason = choose_initial_model(transcript)
+    results = extract_tasks_from_transcript(transcript, model_name=initial_model)
+
+    routing = {
+        "initial_model": initial_model,
+        "final_model": initial_model,
+        "route_reason": route_reason,
+        "escalated": False,
+        "escalation_reason": None,
+        "outcome": "accepted"
+    }
+
+    if initial_model != STRONG_MODEL:
+        escalation_reason, stats = assess_extraction(results)
+        routing["quality"] = stats
+        if escalation_reason:
+            logger.info("Escalating %s -> %s (%s, %s)", initial_model, STRONG_MODEL, escalation_reason, stats)
+            strong_results = extract_tasks_from_transcript(transcript, model_name=STRONG_MODEL)
+            routing.update({"escalated": True, "escalation_reason": escalation_reason})
+            if strong_results.get('extraction_error') and not results.get('extraction_error'):
+                # Keep the cheap result if the strong model failed outright
+                logger.warning("Strong model %s failed, keeping %s result: %s", STRONG_MODEL, initial_model,
+                               strong_results['extraction_error'])
+                routing["outcome"] = "strong_failed"
+            else:
+                results = strong_results
+                routing.update({"final_model": STRONG_MODEL, "outcome": "escalated"})
+
+    CASCADE_ROUTES.inc(initial_model=initial_model, route_reason=route_reason,
+                       escalation_reason=routing["escalation_reason"] or 'none', outcome=routing["outcome"])
+    logger.info("Routed transcript (%d words) to %s: %s", len(transcript.split()), routing["final_model"], routing)
+
+    results["routing"] = routing
+    return results
+
+def summarize_routing(routings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize escalation rates over a batch of routing records.
+    """
+    total = len(routings)
+    escalated = [routing for routing in routings if routing.get('escalated')]
+    reasons: Dict[str, int] = {}
+    for routing in escalated:
+        reasons[routing['escalation_reason']] = reasons.get(routing['escalation_reason'], 0) + 1
+    return {
+        "total": total,
+        "fast_first": sum(1 for routing in routings if routing.get('initial_model') == FAST_MODEL),
+        "escalated": len(escalated),
+        "escalation_rate": round(len(escalated) / total, 3) if total else 0.0,
+        "strong_failed": sum(1 for routing in routings if routing.get('outcome') == 'strong_failed'),
+        "escalation_reasons": reasons
+    }
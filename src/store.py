@@ -0,0 +1,521 @@
+# src/store.py
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import calendar
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+DEFAULT_STORE_PATH = 'data/task_store.db'
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id TEXT PRIMARY KEY,
+    name TEXT,
+    meeting_summary TEXT,
+    decisions TEXT,
+    participants TEXT,
+    total_tasks INTEGER NOT NULL,
+    meeting_date TEXT,
+    model TEXT,
+    pipeline_version TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    meeting_id TEXT NOT NULL REFERENCES meetings(meeting_id),
+    position INTEGER NOT NULL,
+    title TEXT,
+    owner TEXT,
+    owner_norm TEXT,
+    deadline TEXT,
+    deadline_date TEXT,
+    priority TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (meeting_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_owner ON tasks (owner_norm, task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (deadline_date, task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority, task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, task_id);
+"""
+
+# Columns added after the first release, applied to existing databases on open
+MIGRATIONS = [
+    ('meetings', 'meeting_date', 'TEXT'),
+    ('meetings', 'model', 'TEXT'),
+    ('meetings', 'pipeline_version', 'TEXT'),
+]
+
+TASK_STATUSES = ('open', 'done', 'cancelled')
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+NUMBER_WORDS = {'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+                'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10}
+
+_MONTH = r'(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+_NUMBER = r'(\d+|' + '|'.join(NUMBER_WORDS) + r')'
+ISO_DATE_PATTERN = re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b')
+MONTH_DAY_PATTERN = re.compile(r'\b' + _MONTH + r'\s+(\d{1,2})(?:st|nd|rd|th)?\b', re.IGNORECASE)
+DAY_MONTH_PATTERN = re.compile(r'\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?' + _MONTH + r'\b', re.IGNORECASE)
+IN_PERIOD_PATTERN = re.compile(r'\b(?:in|within|next)\s+' + _NUMBER + r'\s+(day|week)s?\b', re.IGNORECASE)
+NEXT_WEEKDAY_PATTERN = re.compile(r'\bnext\s+(' + '|'.join(WEEKDAYS) + r')\b', re.IGNORECASE)
+WEEKDAY_PATTERN = re.compile(r'\b(' + '|'.join(WEEKDAYS) + r')\b', re.IGNORECASE)
+KEYWORD_PATTERNS = [
+    ('tomorrow', re.compile(r'\btomorrow\b', re.IGNORECASE)),
+    ('next_week', re.compile(r'\bnext\s+week\b', re.IGNORECASE)),
+    ('end_of_month', re.compile(r'\b(?:end\s+of\s+(?:the\s+)?month|eom)\b', re.IGNORECASE)),
+    ('end_of_week', re.compile(r'\b(?:this\s+week|end\s+of\s+(?:the\s+)?week|eow)\b', re.IGNORECASE)),
+    ('today', re.compile(r'\b(?:today|tonight|this\s+(?:morning|afternoon|evening)|eod\b(?![ \t]+[a-z]))',
+                         re.IGNORECASE)),
+]
+
+
+def compute_content_hash(transcript: str) -> str:
+    """
+    Compute the content hash used as the meeting id for a transcript.
+
+    Args:
+        transcript (str): Processed transcript text
+
+    Returns:
+        str: Hex SHA-256 digest of the transcript
+    """
+    return hashlib.sha256(transcript.encode('utf-8')).hexdigest()
+
+
+def normalize_owner(owner: Optional[str]) -> str:
+    """
+    Normalize an owner name for indexed lookups.
+    """
+    return (owner or 'TBD').strip().lower()
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """
+    Normalize a task title for matching tasks across re-analyses.
+    """
+    return ' '.join((title or '').lower().split())
+
+
+def normalize_priority(priority: Optional[str]) -> str:
+    """
+    Normalize priority to High/Medium/Low casing.
+    """
+    return (priority or 'Medium').strip().capitalize()
+
+
+def parse_deadline_date(deadline: Optional[str], reference: Optional[date] = None) -> Optional[str]:
+    """
+    Resolve a deadline string to an ISO date (YYYY-MM-DD).
+
+    Literal ISO dates are always used. Relative deadlines ('tomorrow', 'by
+    Friday', 'next week', 'November 20th', 'in two weeks') are resolved against
+    the reference date, normally the day the meeting took place. Without a
+    reference date only literal ISO dates are resolved.
+
+    Conventions: a bare weekday is its next occurrence after the reference day,
+    'next <weekday>' is that weekday in the following week, 'this week' and
+    'next week' mean Friday of that week, and a month/day already past this
+    year rolls over to next year.
+
+    Args:
+        deadline (str): Deadline text from the extraction
+        reference (date): Date the deadline is relative to
+
+    Returns:
+        Optional[str]: ISO date, or None when the deadline cannot be resolved
+    """
+    if not deadline:
+        return None
+    match = ISO_DATE_PATTERN.search(deadline)
+    if match:
+        try:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3))).isoformat()
+        except ValueError:
+            return None
+    if reference is None:
+        return None
+    resolved = _resolve_relative_deadline(deadline, reference)
+    return resolved.isoformat() if resolved else None
+
+
+def _resolve_relative_deadline(deadline: str, reference: date) -> Optional[date]:
+    """
+    Resolve the earliest-mentioned relative date expression in a deadline string.
+    """
+    candidates = []
+
+    for pattern, month_group, day_group in ((MONTH_DAY_PATTERN, 1, 2), (DAY_MONTH_PATTERN, 2, 1)):
+        for match in pattern.finditer(deadline):
+            month = MONTHS[match.group(month_group).lower()]
+            try:
+                resolved = date(reference.year, month, int(match.group(day_group)))
+                if resolved < reference:
+                    resolved = resolved.replace(year=reference.year + 1)
+            except ValueError:
+                continue
+            candidates.append((match.start(), resolved))
+
+    for match in IN_PERIOD_PATTERN.finditer(deadline):
+        amount = match.group(1).lower()
+        amount = int(amount) if amount.isdigit() else NUMBER_WORDS[amount]
+        days = amount * 7 if match.group(2).lower() == 'week' else amount
+        candidates.append((match.start(), reference + timedelta(days=days)))
+
+    next_weekday_spans = []
+    for match in NEXT_WEEKDAY_PATTERN.finditer(deadline):
+        weekday = WEEKDAYS.index(match.group(1).lower())
+        next_monday = reference + timedelta(days=7 - reference.weekday())
+        candidates.append((match.start(), next_monday + timedelta(days=weekday)))
+        next_weekday_spans.append(match.span(1))
+
+    for match in WEEKDAY_PATTERN.finditer(deadline):
+        if match.span(1) in next_weekday_spans:
+            continue
+        weekday = WEEKDAYS.index(match.group(1).lower())
+        days_ahead = (weekday - reference.weekday() - 1) % 7 + 1
+        candidates.append((match.start(), reference + timedelta(days=days_ahead)))
+
+    for keyword, pattern in KEYWORD_PATTERNS:
+        for match in pattern.finditer(deadline):
+            candidates.append((match.start(), _resolve_keyword(keyword, reference)))
+
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: candidate[0])[1]
+
+
+def _resolve_keyword(keyword: str, reference: date) -> date:
+    """
+    Resolve one of the KEYWORD_PATTERNS expressions against a reference date.
+    """
+    friday = reference + timedelta(days=4 - reference.weekday())
+    if keyword == 'tomorrow':
+        return reference + timedelta(days=1)
+    if keyword == 'next_week':
+        return friday + timedelta(days=7)
+    if keyword == 'end_of_month':
+        return reference.replace(day=calendar.monthrange(reference.year, reference.month)[1])
+    if keyword == 'end_of_week':
+        return max(friday, reference)
+    return reference
+
+
+class TaskStore:
+    """
+    SQLite-backed store of analyzed meetings and their tasks.
+
+    Meetings are keyed by the content hash of their transcript, so storing the
+    same transcript twice is a no-op and lookups return the original results.
+    """
+
+    def __init__(self, db_path: str = None):
+        if db_path is None:
+            db_path = os.getenv('TASK_STORE_PATH', DEFAULT_STORE_PATH)
+        self.db_path = db_path
+        self._local = threading.local()
+
+        directory = os.path.dirname(db_path)
+        if directory and db_path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection, opening it on first use.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection, migrations: List[Tuple[str, str, str]] = MIGRATIONS) -> None:
+        """
+        Add columns introduced after a database was first created.
+        """
+        for table, column, column_type in migrations:
+            existing = {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}
+            if column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+    def get_analysis(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a stored analysis by meeting id (transcript content hash).
+
+        Args:
+            meeting_id (str): Content hash of the transcript
+
+        Returns:
+            Optional[Dict[str, Any]]: Stored analysis, or None if not found
+        """
+        conn = self._connect()
+        row = conn.execute('SELECT * FROM meetings WHERE meeting_id = ?', (meeting_id,)).fetchone()
+        if row is None:
+            return None
+
+        task_rows = conn.execute(
+            'SELECT * FROM tasks WHERE meeting_id = ? ORDER BY position', (meeting_id,)
+        ).fetchall()
+
+        return {
+            "meeting_id": row['meeting_id'],
+            "name": row['name'],
+            "tasks": [self._row_to_task(task_row) for task_row in task_rows],
+            "meeting_summary": row['meeting_summary'] or '',
+            "decisions": json.loads(row['decisions'] or '[]'),
+            "participants": json.loads(row['participants'] or '[]'),
+            "total_tasks": row['total_tasks'],
+            "meeting_date": row['meeting_date'],
+            "model": row['model'],
+            "pipeline_version": row['pipeline_version'],
+            "created_at": row['created_at']
+        }
+
+    def save_analysis(self, meeting_id: str, tasks: List[Dict[str, Any]], meeting_summary: str = '',
+                      decisions: List[str] = None, participants: List[str] = None,
+                      name: str = None, meeting_date: str = None, model: str = None,
+                      pipeline_version: str = None, replace: bool = False) -> bool:
+        """
+        Store an analysis and its tasks. Idempotent per meeting id unless
+        replace is set.
+
+        Args:
+            meeting_id (str): Content hash of the transcript
+            tasks: Planned tasks for the meeting
+            meeting_summary (str): Meeting summary
+            decisions: Key decisions
+            participants: Meeting participants
+            name (str): Optional human-readable meeting name
+            meeting_date (str): ISO date the meeting took place; relative
+                deadlines are resolved against it (defaults to today)
+            model (str): Model whose extraction produced the tasks
+            pipeline_version (str): Pipeline version that produced the analysis
+            replace (bool): Overwrite an existing analysis of the same meeting
+                (e.g. one from an older pipeline version) and its tasks. New
+                tasks whose title matches an old one keep its task id and status
+
+        Returns:
+            bool: True if the meeting was inserted, False if it was already stored
+        """
+        created_at = datetime.now()
+        now = created_at.isoformat()
+        reference = date.fromisoformat(meeting_date) if meeting_date else created_at.date()
+        conn = self._connect()
+        with conn:
+            previous = {}
+            if replace:
+                previous = self._previous_tasks(conn, meeting_id)
+                self._delete_meetings(conn, [meeting_id])
+            cursor = conn.execute(
+                """
+                INSERT INTO meetings (meeting_id, name, meeting_summary, decisions, participants,
+                                      total_tasks, meeting_date, model, pipeline_version, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (meeting_id) DO NOTHING
+                """,
+                (meeting_id, name, meeting_summary, json.dumps(decisions or []),
+                 json.dumps(participants or []), len(tasks), reference.isoformat(), model,
+                 pipeline_version, now)
+            )
+            if cursor.rowcount == 0:
+                return False
+
+            rows = []
+            for position, task in enumerate(tasks):
+                task_id = None
+                status = task.get('status') if task.get('status') in TASK_STATUSES else 'open'
+                matches = previous.get(normalize_title(task.get('title')))
+                if matches:
+                    # Keep ids and statuses set via PATCH across re-analysis
+                    task_id, previous_status = matches.pop(0)
+                    if previous_status != 'open':
+                        status = previous_status
+                rows.append((task_id, meeting_id, position, task.get('title', ''), task.get('owner', 'TBD'),
+                             normalize_owner(task.get('owner')), task.get('deadline', 'TBD'),
+                             parse_deadline_date(task.get('deadline'), reference),
+                             normalize_priority(task.get('priority')), status, json.dumps(task), now))
+            conn.executemany(
+                """
+                INSERT INTO tasks (task_id, meeting_id, position, title, owner, owner_norm, deadline,
+                                   deadline_date, priority, status, payload, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+        return True
+
+    @staticmethod
+    def _previous_tasks(conn: sqlite3.Connection, meeting_id: str) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Map normalized titles to the (task_id, status) of a meeting's stored tasks, in order.
+        """
+        previous = {}
+        for row in conn.execute(
+                'SELECT task_id, title, status FROM tasks WHERE meeting_id = ? ORDER BY position',
+                (meeting_id,)):
+            previous.setdefault(normalize_title(row['title']), []).append((row['task_id'], row['status']))
+        return previous
+
+    def invalidate_analyses(self, model: str = None, keep_pipeline_version: str = None) -> int:
+        """
+        Delete stored analyses so their transcripts are re-analyzed on the next
+        submission, e.g. after a degraded model or pipeline release.
+
+        Args:
+            model (str): Delete analyses produced by this model
+            keep_pipeline_version (str): Delete analyses from any other
+                pipeline version (including ones stored before versions were recorded)
+
+        Returns:
+            int: Number of meetings deleted
+        """
+        clauses = []
+        params: List[Any] = []
+        if model:
+            clauses.append('model = ?')
+            params.append(model)
+        if keep_pipeline_version:
+            clauses.append('(pipeline_version IS NULL OR pipeline_version != ?)')
+            params.append(keep_pipeline_version)
+        if not clauses:
+            raise ValueError("Specify a model and/or a pipeline version to keep")
+
+        conn = self._connect()
+        with conn:
+            meeting_ids = [row['meeting_id'] for row in conn.execute(
+                f"SELECT meeting_id FROM meetings WHERE {' OR '.join(clauses)}", params)]
+            self._delete_meetings(conn, meeting_ids)
+        return len(meeting_ids)
+
+    @staticmethod
+    def _delete_meetings(conn: sqlite3.Connection, meeting_ids: List[str]) -> None:
+        """
+        Delete meetings and their tasks inside the caller's transaction.
+        """
+        conn.executemany('DELETE FROM tasks WHERE meeting_id = ?', [(mid,) for mid in meeting_ids])
+        conn.executemany('DELETE FROM meetings WHERE meeting_id = ?', [(mid,) for mid in meeting_ids])
+
+    def query_tasks(self, owner: str = None, priority: str = None, meeting_id: str = None,
+                    status: str = None, deadline: str = None, due_before: str = None,
+                    due_after: str = None, limit: int = 50,
+                    after: int = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Query stored tasks with optional filters and keyset pagination.
+
+        Args:
+            owner (str): Owner name (case-insensitive exact match)
+            priority (str): High/Medium/Low
+            meeting_id (str): Restrict to one meeting
+            status (str): open/done/cancelled
+            deadline (str): Exact deadline text (case-insensitive)
+            due_before (str): ISO date; only tasks with a resolved deadline on or before it
+            due_after (str): ISO date; only tasks with a resolved deadline on or after it
+            limit (int): Page size (capped at MAX_PAGE_SIZE)
+            after (int): Cursor returned by the previous page
+
+        Returns:
+            Tuple of (tasks, next_cursor). next_cursor is None on the last page.
+        """
+        clauses = []
+        params: List[Any] = []
+
+        if owner:
+            clauses.append('owner_norm = ?')
+            params.append(normalize_owner(owner))
+        if priority:
+            clauses.append('priority = ?')
+            params.append(normalize_priority(priority))
+        if meeting_id:
+            clauses.append('meeting_id = ?')
+            params.append(meeting_id)
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        if deadline:
+            clauses.append('deadline = ? COLLATE NOCASE')
+            params.append(deadline)
+        if due_before:
+            clauses.append('deadline_date <= ?')
+            params.append(due_before)
+        if due_after:
+            clauses.append('deadline_date >= ?')
+            params.append(due_after)
+        if after is not None:
+            clauses.append('task_id > ?')
+            params.append(after)
+
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        # Fetch one extra row to know whether another page exists
+        rows = self._connect().execute(
+            f'SELECT * FROM tasks {where} ORDER BY task_id LIMIT ?', params + [limit + 1]
+        ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1]['task_id']
+
+        return [self._row_to_task(row) for row in rows], next_cursor
+
+    def update_task_status(self, task_id: int, status: str) -> bool:
+        """
+        Update the status of a stored task.
+
+        Returns:
+            bool: True if the task exists and was updated
+        """
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Invalid status '{status}'. Expected one of: {', '.join(TASK_STATUSES)}")
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute('UPDATE tasks SET status = ? WHERE task_id = ?', (status, task_id))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Convert a task row back into the task dict returned by the pipeline.
+        """
+        task = json.loads(row['payload'])
+        task['task_id'] = row['task_id']
+        task['meeting_id'] = row['meeting_id']
+        task['status'] = row['status']
+        return task
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> TaskStore:
+    """
+    Return the process-wide task store, creating it on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TaskStore()
+    return _store
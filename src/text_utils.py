@@ -0,0 +1,58 @@
+# src/text_utils.py
+# Text helpers shared by evaluation and serving code. Keep this free of
+# heavy dependencies: it is imported on the serving path.
+import re
+from typing import Any, Iterator, Set, Tuple
+
+# A speaker label opens a line: one to four capitalized words or numbers
+# ("Mira:", "Speaker 2:", "Dr. Priya Shah:") followed by a colon and
+# whitespace. Lowercase words ("Action items:") and times ("10:30") do not match.
+SPEAKER_PATTERN = re.compile(r"^[ \t]*([A-Z][\w.'’-]*(?:[ \t]+(?:[A-Z][\w.'’-]*|\d+)){0,3})[ \t]*:(?=\s|$)",
+                             re.MULTILINE)
+# Capitalized section headings that look like speaker labels
+NON_SPEAKER_LABELS = {'action items', 'agenda', 'attendees', 'decisions', 'next steps', 'note', 'notes',
+                      'participants', 'summary', 'todo'}
+
+def preprocess_text(text: str) -> str:
+    """
+    Normalize text for comparison.
+    """
+    if not isinstance(text, str):
+        return ""
+    # Convert to lowercase, remove extra spaces, and basic normalization
+    text = text.lower().strip()
+    text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
+    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+    return text
+
+def speaker_turns(transcript: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (character offset, speaker name) for each speaker label in a transcript.
+    """
+    for match in SPEAKER_PATTERN.finditer(transcript):
+        name = match.group(1).strip()
+        if name.lower() not in NON_SPEAKER_LABELS:
+            yield match.start(), name
+
+def word_set(text: str) -> Set[str]:
+    """
+    Set of normalized words in a text.
+    """
+    return set(preprocess_text(text).split())
+
+def jaccard_similarity(words_a: Set[str], words_b: Set[str]) -> float:
+    """
+    Jaccard similarity between two word sets.
+    """
+    union = len(words_a | words_b)
+    return len(words_a & words_b) / union if union > 0 else 0
+
+def as_float(value: Any, default: float = 0.0) -> float:
+    """
+    Coerce a model-supplied number (e.g. a confidence of "0.9" or null) to
+    float, falling back to default.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
@@ -1,14 +1,18 @@
 # src/understand.py
 from typing import List, Dict, Any
 from .gemini_client import extract_tasks_from_transcript
+from .metrics import stage_timer, TASKS_EXTRACTED
+from .router import extract_with_cascade, cascade_enabled
 
-def analyze_meeting(transcript: str, api_key: str = None) -> Dict[str, Any]:
+def analyze_meeting(transcript: str, api_key: str = None, use_cascade: bool = None) -> Dict[str, Any]:
     """
     Main function to analyze meeting transcript and extract structured information.
     
     Args:
         transcript (str): The meeting transcript
         api_key (str): Google AI Studio API key
+        use_cascade (bool): Route through the fast/strong model cascade.
+            Defaults to the CASCADE_ENABLED environment setting.
         
     Returns:
         Dict[str, Any]: Structured analysis results
@@ -18,7 +22,15 @@ def analyze_meeting(transcript: str, api_key: str = None) -> Dict[str, Any]:
     setup_gemini(api_key)
     
     # Extract tasks and meeting insights
-    results = extract_tasks_from_transcript(transcript)
+    if use_cascade is None:
+        use_cascade = cascade_enabled()
+    
+    with stage_timer('understand'):
+        if use_cascade:
+            results = extract_with_cascade(transcript)
+        else:
+            results = extract_tasks_from_transcript(transcript)
+    TASKS_EXTRACTED.observe(len(results.get('tasks', [])), stage='understand')
     
     return results
 
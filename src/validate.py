@@ -1,9 +1,19 @@
 # src/validate.py
 from typing import List, Dict, Any
+from .metrics import stage_timer, TASKS_EXTRACTED
+from .text_utils import as_float
 
+@stage_timer('validate')
 def validate_tasks(tasks: List[Dict[str, Any]], participants: List[str]) -> List[Dict[str, Any]]:
     """
     Validate extracted tasks against participant list and add validation flags.
+    """
+    return check_tasks(tasks, participants)
+
+def check_tasks(tasks: List[Dict[str, Any]], participants: List[str]) -> List[Dict[str, Any]]:
+    """
+    Untimed core of validate_tasks, for callers that only inspect the result
+    (the model router) so the validate stage is not counted twice.
     
     Args:
         tasks: List of extracted tasks
@@ -25,7 +35,7 @@ def validate_tasks(tasks: List[Dict[str, Any]], participants: List[str]) -> List
             validated_task['owner_valid'] = owner_valid
             if not owner_valid:
                 # Reduce confidence if owner doesn't match participants
-                validated_task['confidence'] = validated_task.get('confidence', 1.0) * 0.7
+                validated_task['confidence'] = as_float(validated_task.get('confidence', 1.0), default=1.0) * 0.7
         else:
             validated_task['owner_valid'] = False
             
@@ -40,6 +50,7 @@ def validate_tasks(tasks: List[Dict[str, Any]], participants: List[str]) -> List
     
     return validated_tasks
 
+@stage_timer('deduplicate')
 def deduplicate_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Remove duplicate tasks based on title similarity.
@@ -53,4 +64,5 @@ def deduplicate_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             seen_titles.add(title)
             unique_tasks.append(task)
     
+    TASKS_EXTRACTED.observe(len(unique_tasks), stage='deduplicate')
     return unique_tasks
\ No newline at end of file
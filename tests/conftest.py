@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# Make `src` importable when pytest is run from any directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
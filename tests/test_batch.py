@@ -0,0 +1,104 @@
+# tests/test_batch.py
+import json
+import os
+
+import pytest
+
+from src import batch
+from src.batch import BatchRunner, compact_manifest, load_manifest
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """
+    Stub the pipelines; transcripts containing 'FAIL' fail extraction.
+    """
+    seen = []
+
+    def fake_pipeline(transcript):
+        seen.append(transcript)
+        if 'FAIL' in transcript:
+            return {'tasks': [], 'extraction_error': 'model unavailable'}
+        return {'tasks': [{'title': 'Send survey'}], 'total_tasks': 1}
+
+    monkeypatch.setattr(batch, 'run_pipeline', fake_pipeline)
+    monkeypatch.setattr(batch, 'run_packed_pipeline',
+                        lambda transcripts: {mid: fake_pipeline(text) for mid, text in transcripts.items()})
+    return seen
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    input_dir, output_dir = tmp_path / 'in', tmp_path / 'out'
+    input_dir.mkdir()
+    (input_dir / 'alpha.txt').write_text('Mira: I will send the survey.\n')
+    (input_dir / 'beta.txt').write_text('Raj: I will book the venue.\n')
+    return input_dir, output_dir
+
+
+def run(dirs, **options):
+    return BatchRunner(str(dirs[0]), str(dirs[1]), workers=2, **options).run()
+
+
+def manifest_lines(dirs):
+    return (dirs[1] / batch.MANIFEST_NAME).read_text().splitlines()
+
+
+@pytest.mark.parametrize('pack', [False, True])
+def test_rerun_skips_unchanged_files_without_reading_them(calls, dirs, pack):
+    assert run(dirs, pack=pack)['processed'] == 2
+    assert (dirs[1] / 'alpha_output.json').exists()
+
+    summary = run(dirs, pack=pack)
+    assert (summary['processed'], summary['skipped']) == (0, 2)
+    assert len(calls) == 2
+    assert len(manifest_lines(dirs)) == 2
+
+
+def test_touched_but_unchanged_file_is_rehashed_and_skipped(calls, dirs):
+    run(dirs)
+    alpha = dirs[0] / 'alpha.txt'
+    stat = alpha.stat()
+    os.utime(alpha, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    summary = run(dirs)
+    assert (summary['processed'], summary['skipped']) == (0, 2)
+    assert len(calls) == 2
+    # The refreshed size/mtime lets the next scan skip it on a stat alone
+    assert load_manifest(str(dirs[1] / batch.MANIFEST_NAME))['alpha']['mtime_ns'] == alpha.stat().st_mtime_ns
+
+    (dirs[0] / 'alpha.txt').write_text('Mira: I will send the new survey.\n')
+    assert run(dirs)['processed'] == 1
+
+
+def test_torn_manifest_line_is_ignored(calls, dirs):
+    run(dirs)
+    with open(dirs[1] / batch.MANIFEST_NAME, 'a', encoding='utf-8') as f:
+        f.write('{"meeting_id": "beta", "content_ha')
+
+    assert set(load_manifest(str(dirs[1] / batch.MANIFEST_NAME))) == {'alpha', 'beta'}
+    summary = run(dirs)
+    assert (summary['processed'], summary['skipped'], summary['failed']) == (0, 2, 0)
+
+
+def test_failed_extraction_is_not_recorded_and_retried(calls, dirs):
+    (dirs[0] / 'gamma.txt').write_text('Leah: FAIL\n')
+
+    summary = run(dirs)
+    assert (summary['processed'], summary['failed'], summary['failed_meetings']) == (2, 1, ['gamma'])
+    assert 'gamma' not in load_manifest(str(dirs[1] / batch.MANIFEST_NAME))
+    assert not (dirs[1] / 'gamma_output.json').exists()
+
+    summary = run(dirs)
+    assert (summary['skipped'], summary['failed']) == (2, 1)
+    assert sum('FAIL' in transcript for transcript in calls) == 2
+
+
+def test_compact_manifest_keeps_latest_record_per_meeting(tmp_path):
+    manifest = tmp_path / batch.MANIFEST_NAME
+    records = [{'meeting_id': 'alpha', 'content_hash': 'a1'}, {'meeting_id': 'beta', 'content_hash': 'b1'},
+               {'meeting_id': 'alpha', 'content_hash': 'a2'}]
+    manifest.write_text(''.join(json.dumps(record) + '\n' for record in records) + '{"meeting_id": ')
+
+    assert compact_manifest(str(manifest)) == 2
+    assert [json.loads(line) for line in manifest.read_text().splitlines()] == [records[2], records[1]]
@@ -0,0 +1,72 @@
+# tests/test_evidence.py
+import pytest
+
+from src.evidence import EvidenceIndex, anchor_tasks, UNANCHORED_PENALTY
+from src.router import count_speakers
+from src.text_utils import speaker_turns
+
+TRANSCRIPT = """Jeffy: Okay folks, let's get started. Mira, where do we stand on the roadmap?
+
+Mira: The Q1 roadmap is mostly set. Onboarding and the analytics pilot are still open.
+
+Action items: see below.
+Standup moved to 10:30: everyone please note.
+
+Jeffy: Onboarding is urgent. Mira, please update the roadmap to reflect that, and push analytics pilot to March?
+
+Mira: Sure, I'll coordinate with design and send the deck by Friday.
+"""
+
+
+def test_locate_exact_match_ignores_case_and_punctuation():
+    anchor = EvidenceIndex(TRANSCRIPT).locate("mira please update the roadmap to reflect that")
+    assert anchor['match'] == 'exact'
+    assert anchor['score'] == 1.0
+    assert TRANSCRIPT[anchor['start']:anchor['end']] == "Mira, please update the roadmap to reflect that"
+    assert anchor['speaker'] == 'Jeffy'
+
+
+def test_locate_fuzzy_match_for_paraphrased_quote():
+    anchor = EvidenceIndex(TRANSCRIPT).locate("please update the roadmap and push the analytics pilot to March")
+    assert anchor['match'] == 'fuzzy'
+    assert anchor['score'] >= 0.9
+    assert 'update the roadmap' in TRANSCRIPT[anchor['start']:anchor['end']]
+    assert anchor['speaker'] == 'Jeffy'
+
+
+def test_locate_returns_none_for_unrelated_or_empty_quotes():
+    index = EvidenceIndex(TRANSCRIPT)
+    assert index.locate("we agreed to migrate the billing database next quarter") is None
+    assert index.locate("") is None
+    assert index.locate(None) is None
+    # Too few words in common to anchor a short quote anywhere
+    assert index.locate("Raj: I'll coordinate.") is None
+
+
+def test_speaker_turns_skip_headings_and_times():
+    speakers = [name for _, name in speaker_turns(TRANSCRIPT)]
+    assert speakers == ['Jeffy', 'Mira', 'Jeffy', 'Mira']
+    assert count_speakers(TRANSCRIPT) == 2
+
+    index = EvidenceIndex(TRANSCRIPT)
+    assert index.speaker_at(TRANSCRIPT.index('everyone please note')) == 'Mira'
+
+
+def test_anchor_tasks_penalizes_unanchored_evidence():
+    tasks = [
+        {"title": "Update roadmap", "confidence": 0.9, "evidence": "push analytics pilot to March"},
+        {"title": "Book venue", "confidence": 0.8, "evidence": "Leah will book the offsite venue"},
+    ]
+    anchored = anchor_tasks(tasks, TRANSCRIPT)
+    assert anchored[0]['evidence_anchored'] is True
+    assert anchored[0]['confidence'] == 0.9
+    assert anchored[1]['evidence_anchor'] is None
+    assert anchored[1]['confidence'] == 0.8 * UNANCHORED_PENALTY
+    assert 'evidence_anchor' not in tasks[0]
+
+
+@pytest.mark.parametrize('confidence, expected', [("0.9", 0.9), (None, 1.0), ("high", 1.0)])
+def test_anchor_tasks_coerces_non_numeric_confidence(confidence, expected):
+    tasks = [{"title": "Book venue", "confidence": confidence, "evidence": "Leah will book the offsite venue"}]
+    anchored = anchor_tasks(tasks, TRANSCRIPT)
+    assert anchored[0]['confidence'] == expected * UNANCHORED_PENALTY
@@ -0,0 +1,202 @@
+# tests/test_lineage.py
+import pytest
+
+import app as app_module
+from src import lineage
+from src.lineage import SeriesLinker, reports_completion
+from src.store import TaskStore
+
+ONBOARDING = {
+    "title": "Make sure onboarding doc is done and shared",
+    "description": "Make sure onboarding doc is done and shared",
+    "owner": "Mira",
+    "deadline": "Friday",
+    "priority": "High",
+    "evidence": "Mira, make sure the onboarding doc is done and shared by Friday."
+}
+
+
+def task(title, owner='Mira', deadline='Friday', priority='High', description=None, evidence=''):
+    return {"title": title, "description": description or title, "owner": owner, "deadline": deadline,
+            "priority": priority, "evidence": evidence}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TaskStore(str(tmp_path / 'tasks.db'))
+
+
+@pytest.fixture
+def linker(store):
+    return SeriesLinker(store)
+
+
+def link(store, linker, meeting_id, tasks, series_id='weekly'):
+    store.save_analysis(meeting_id, tasks)
+    return linker.link_tasks(series_id, meeting_id, store.get_analysis(meeting_id)['tasks'])
+
+
+def statuses(tasks):
+    return [task['lineage']['status'] for task in tasks]
+
+
+@pytest.mark.parametrize('evidence, completed', [
+    ("Make sure onboarding doc is done and shared", False),
+    ("I'll have the deck done by Friday.", False),
+    ("Once it's merged, ping me.", False),
+    ("It's not done yet.", False),
+    ("Mira: I sent the deck yesterday.", True),
+    ("Raj: Yes, the onboarding doc is done and shared with the team.", True),
+    ("We've finished the audit.", True),
+    ("Already merged.", True),
+])
+def test_reports_completion_requires_finished_work(evidence, completed):
+    assert reports_completion(evidence) is completed
+
+
+def test_link_labels(store, linker):
+    first = link(store, linker, 'm1', [
+        task('Update the product roadmap'),
+        task('Send the survey to customers', owner='Leah', deadline='Monday'),
+        task('Prepare the budget slides', owner='Raj'),
+    ])
+    assert statuses(first) == ['new', 'new', 'new']
+
+    second = link(store, linker, 'm2', [
+        task('Update the product roadmap'),
+        task('Send the survey to customers', owner='Leah', deadline='Wednesday'),
+        task('Prepare budget slides', owner='Raj', evidence='Raj: I sent the budget slides this morning.'),
+        task('Book the offsite venue', owner='Leah'),
+    ])
+    assert statuses(second) == ['carried_over', 'updated', 'completed', 'new']
+    assert second[0]['lineage']['series_task_id'] == first[0]['lineage']['series_task_id']
+    assert second[0]['lineage']['occurrences'] == 2
+    assert second[0]['lineage']['first_meeting_id'] == 'm1'
+
+    open_titles = [row['title'] for row in linker.open_tasks('weekly')]
+    assert 'Prepare budget slides' not in open_titles
+    assert [row['title'] for row in linker.open_tasks('weekly', owner='leah')] == \
+        ['Send the survey to customers', 'Book the offsite venue']
+
+
+def test_link_is_idempotent_per_meeting(store, linker):
+    link(store, linker, 'm1', [task('Update the product roadmap')])
+    first = link(store, linker, 'm2', [task('Update the product roadmap')])
+    again = linker.link_tasks('weekly', 'm2', store.get_analysis('m2')['tasks'])
+
+    assert [t['lineage'] for t in again] == [t['lineage'] for t in first]
+    assert linker.open_tasks('weekly')[0]['occurrences'] == 2
+
+
+def test_same_owner_required_and_series_are_separate(store, linker):
+    link(store, linker, 'm1', [task('Update the product roadmap')])
+    assert statuses(link(store, linker, 'm2', [task('Update the product roadmap', owner='Raj')])) == ['new']
+    assert statuses(link(store, linker, 'm3', [task('Update the product roadmap')], series_id='other')) == ['new']
+
+
+def test_explicit_done_status_from_model_completes_task(store, linker):
+    link(store, linker, 'm1', [task('Update the product roadmap')])
+    done = dict(task('Update the product roadmap'), status='done')
+    assert statuses(link(store, linker, 'm2', [done])) == ['completed']
+    assert linker.open_tasks('weekly') == []
+
+
+def test_open_tasks_age_out(store, linker, monkeypatch):
+    monkeypatch.setattr(lineage, 'STALE_AFTER_MEETINGS', 2)
+    link(store, linker, 'm1', [task('Update the product roadmap'), task('Send the survey', owner='Leah')])
+    link(store, linker, 'm2', [task('Send the survey', owner='Leah')])
+    assert len(linker.open_tasks('weekly')) == 2
+
+    link(store, linker, 'm3', [task('Send the survey', owner='Leah')])
+    assert [row['title'] for row in linker.open_tasks('weekly')] == ['Send the survey']
+
+    # A stale task is no longer matched; it comes back as a new series task
+    assert statuses(link(store, linker, 'm4', [task('Update the product roadmap')])) == ['new']
+
+
+def test_task_status_changes_sync_to_series(store, linker):
+    linked = link(store, linker, 'm1', [task('Update the product roadmap')])
+    task_id = linked[0]['task_id']
+
+    store.update_task_status(task_id, 'done')
+    assert linker.sync_task_status(task_id, 'done') == 1
+    assert linker.open_tasks('weekly') == []
+    assert statuses(link(store, linker, 'm2', [task('Update the product roadmap')])) == ['new']
+
+    store.update_task_status(task_id, 'open')
+    assert linker.sync_task_status(task_id, 'open') == 1
+    assert len(linker.open_tasks('weekly')) == 2
+
+    unlinked = store.query_tasks(meeting_id='m2')[0][0]['task_id'] + 100
+    assert linker.sync_task_status(unlinked, 'done') == 0
+
+
+def test_reanalyzed_meeting_is_relinked(store, linker):
+    link(store, linker, 'm1', [task('Update roadmap'), task('Send survey')])
+    store.save_analysis('m1', [task('Send survey')], replace=True)
+    survey_id = store.get_analysis('m1')['tasks'][0]['task_id']
+
+    # The old links point at 'Update roadmap' for position 0 and must not close it
+    assert linker.sync_task_status(survey_id, 'done') == 0
+
+    relinked = linker.link_tasks('weekly', 'm1', store.get_analysis('m1')['tasks'])
+    assert statuses(relinked) == ['new']
+    assert [row['title'] for row in linker.open_tasks('weekly')] == ['Send survey']
+    assert relinked[0]['lineage']['occurrences'] == 1
+
+    store.update_task_status(survey_id, 'done')
+    assert linker.sync_task_status(survey_id, 'done') == 1
+    assert linker.open_tasks('weekly') == []
+
+
+def test_relinking_undoes_completion_from_replaced_analysis(store, linker):
+    first = link(store, linker, 'm1', [task('Update the product roadmap')])
+    done = link(store, linker, 'm2', [task('Update the product roadmap',
+                                           evidence='Mira: I shipped the roadmap update.')])
+    assert statuses(done) == ['completed']
+
+    store.save_analysis('m2', [task('Book the offsite venue')], replace=True)
+    relinked = linker.link_tasks('weekly', 'm2', store.get_analysis('m2')['tasks'])
+    assert statuses(relinked) == ['new']
+
+    open_tasks = {row['title']: row for row in linker.open_tasks('weekly')}
+    assert set(open_tasks) == {'Update the product roadmap', 'Book the offsite venue'}
+    roadmap = open_tasks['Update the product roadmap']
+    assert roadmap['series_task_id'] == first[0]['lineage']['series_task_id']
+    assert roadmap['occurrences'] == 1
+    assert statuses(link(store, linker, 'm3', [task('Update the product roadmap')])) == ['carried_over']
+
+
+@pytest.fixture
+def client(store, linker, monkeypatch):
+    def fake_pipeline(transcript):
+        return {"tasks": [dict(ONBOARDING)], "meeting_summary": "Weekly sync",
+                "decisions": [], "participants": ["Mira"], "total_tasks": 1,
+                "model": "test-model", "pipeline_version": app_module.PIPELINE_VERSION}
+
+    monkeypatch.setattr(app_module, 'get_store', lambda: store)
+    monkeypatch.setattr(app_module, 'get_linker', lambda: linker)
+    monkeypatch.setattr(app_module, 'run_pipeline', fake_pipeline)
+    return app_module.app.test_client()
+
+
+def test_restated_goal_is_carried_over_not_completed(client):
+    first = client.post('/analyze', json={"transcript": "Mira: week one", "series_id": "x"}).get_json()
+    second = client.post('/analyze', json={"transcript": "Mira: week two", "series_id": "x"}).get_json()
+
+    assert first['tasks'][0]['lineage']['status'] == 'new'
+    assert second['tasks'][0]['lineage']['status'] == 'carried_over'
+    assert second['lineage_summary']['completed'] == 0
+
+    listed = client.get('/series/x/tasks').get_json()
+    assert [row['title'] for row in listed['tasks']] == [ONBOARDING['title']]
+    assert listed['tasks'][0]['occurrences'] == 2
+
+
+def test_patch_closes_series_task(client):
+    analyzed = client.post('/analyze', json={"transcript": "Mira: week one", "series_id": "x"}).get_json()
+    task_id = analyzed['tasks'][0]['task_id']
+
+    response = client.patch(f'/tasks/{task_id}', json={"status": "done"}).get_json()
+    assert response['series_tasks_updated'] == 1
+    assert client.get('/series/x/tasks').get_json()['tasks'] == []
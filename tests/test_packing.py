@@ -0,0 +1,86 @@
+# tests/test_packing.py
+import pytest
+
+from src.packing import pack_transcripts, build_packed_prompt, split_packed_response, estimate_tokens
+
+
+def transcript(tokens):
+    return 'x' * ((tokens - 1) * 4)
+
+
+def test_pack_transcripts_first_fit_decreasing():
+    transcripts = {'a': transcript(50), 'b': transcript(40), 'c': transcript(30), 'd': transcript(20)}
+    assert [estimate_tokens(text) for text in transcripts.values()] == [50, 40, 30, 20]
+
+    packs = pack_transcripts(transcripts, token_budget=70, max_meetings=8)
+    assert packs == [['a', 'd'], ['b', 'c']]
+
+
+def test_pack_transcripts_respects_max_meetings():
+    transcripts = {f'm{i}': transcript(10) for i in range(5)}
+    packs = pack_transcripts(transcripts, token_budget=1000, max_meetings=2)
+    assert [len(pack) for pack in packs] == [2, 2, 1]
+    assert sorted(mid for pack in packs for mid in pack) == sorted(transcripts)
+
+
+def test_pack_transcripts_oversized_meeting_gets_its_own_pack():
+    transcripts = {'huge': transcript(500), 'small': transcript(10)}
+    assert pack_transcripts(transcripts, token_budget=100) == [['huge'], ['small']]
+    assert pack_transcripts({}) == []
+
+
+def test_build_packed_prompt_labels_meetings_in_pack_order():
+    prompt, labels = build_packed_prompt({'file-b.txt': 'B: hello', 'file-a.txt': 'A: hi'},
+                                         ['file-b.txt', 'file-a.txt'])
+    assert labels == {'m1': 'file-b.txt', 'm2': 'file-a.txt'}
+    assert '<meeting id="m1">\nB: hello\n</meeting>' in prompt
+    assert 'file-b.txt' not in prompt
+
+
+LABELS = {'m1': 'alpha', 'm2': 'beta'}
+VALID = {"tasks": [{"title": "Ship it"}], "meeting_summary": "s", "decisions": [], "participants": []}
+
+
+@pytest.mark.parametrize('parsed', [
+    None,
+    [],
+    "meetings",
+    {},
+    {"meetings": None},
+    {"meetings": [VALID, VALID]},
+    {"tasks": []},
+])
+def test_split_packed_response_rejects_malformed_envelopes(parsed):
+    results, failed = split_packed_response(parsed, LABELS)
+    assert results == {}
+    assert failed == ['alpha', 'beta']
+
+
+@pytest.mark.parametrize('entry', [
+    None,
+    "not a dict",
+    {},
+    {"tasks": "Ship it"},
+    {"tasks": ["Ship it"]},
+    {"tasks": [{"title": ""}]},
+    {"tasks": [{"owner": "Mira"}]},
+    {"tasks": [{"title": "ok"}, None]},
+])
+def test_split_packed_response_falls_back_for_malformed_entries(entry):
+    results, failed = split_packed_response({"meetings": {"m1": VALID, "m2": entry}}, LABELS)
+    assert results == {'alpha': VALID}
+    assert failed == ['beta']
+
+
+def test_split_packed_response_ignores_unknown_and_missing_labels():
+    parsed = {"meetings": {"m1": VALID, "m9": VALID, "alpha": VALID}}
+    results, failed = split_packed_response(parsed, LABELS)
+    assert list(results) == ['alpha']
+    assert failed == ['beta']
+
+
+def test_split_packed_response_accepts_meeting_without_tasks():
+    empty = {"tasks": [], "meeting_summary": "Status update only"}
+    results, failed = split_packed_response({"meetings": {"m1": empty, "m2": VALID}}, LABELS)
+    assert results == {'alpha': empty, 'beta': VALID}
+    assert failed == []
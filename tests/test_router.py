@@ -0,0 +1,104 @@
+# tests/test_router.py
+import pytest
+
+from src import router
+from src.router import FAST_MODEL, STRONG_MODEL, choose_initial_model, assess_extraction, extract_with_cascade
+
+PARTICIPANTS = ['Mira', 'Leah', 'Raj']
+SHORT = 'Mira: Let us ship the release.\nLeah: I will send the survey.'
+
+
+def task(title='Send survey', owner='Leah', confidence=0.9):
+    return {"title": title, "owner": owner, "deadline": 'TBD', "confidence": confidence}
+
+
+def extraction(tasks, **extra):
+    return {"tasks": tasks, "meeting_summary": 'Planning', "participants": PARTICIPANTS, **extra}
+
+
+def test_choose_initial_model():
+    assert choose_initial_model(SHORT) == (FAST_MODEL, 'short_transcript')
+    assert choose_initial_model('word ' * (router.SHORT_TRANSCRIPT_WORDS + 1)) == (STRONG_MODEL, 'long_transcript')
+    crowded = '\n'.join(f'Speaker{i}: hello' for i in range(router.MAX_SIMPLE_SPEAKERS + 1))
+    assert choose_initial_model(crowded) == (STRONG_MODEL, 'many_speakers')
+
+
+@pytest.mark.parametrize('results, reason', [
+    (extraction([], extraction_error='boom'), 'extraction_failed'),
+    (extraction('not a list'), 'malformed_tasks'),
+    (extraction([task(), {"owner": 'Raj'}]), 'malformed_tasks'),
+    ({"tasks": [], "meeting_summary": ''}, 'empty_result'),
+    (extraction([task(confidence=0.2), task('Book venue', confidence=0.5)]), 'low_confidence'),
+    (extraction([task(owner='Zed'), task('Book venue', owner='Quinn'), task('Fix bug', owner='Raj')]),
+     'invalid_owners'),
+])
+def test_assess_extraction_escalation_reasons(results, reason):
+    assert assess_extraction(results)[0] == reason
+
+
+def test_assess_extraction_accepts_good_results_and_ignores_tbd_owners():
+    reason, stats = assess_extraction(extraction([task(), task('Book venue', owner='TBD'),
+                                                  task('Draft agenda', owner='TBD')]))
+    assert reason is None
+    assert stats == {"task_count": 3, "mean_confidence": 0.9, "invalid_owner_ratio": 0.0}
+    assert assess_extraction(extraction([])) == (None, {"task_count": 0})
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """
+    Stub extract_tasks_from_transcript with per-model canned results.
+    """
+    canned, models = {}, []
+
+    def fake_extract(transcript, model_name=None):
+        models.append(model_name)
+        return dict(canned[model_name])
+
+    monkeypatch.setattr(router, 'extract_tasks_from_transcript', fake_extract)
+    return canned, models
+
+
+def test_extract_with_cascade_accepts_fast_result(calls):
+    canned, models = calls
+    canned[FAST_MODEL] = extraction([task()])
+
+    routing = extract_with_cascade(SHORT)['routing']
+    assert models == [FAST_MODEL]
+    assert routing['outcome'] == 'accepted'
+    assert routing['final_model'] == FAST_MODEL and routing['escalated'] is False
+
+
+def test_extract_with_cascade_escalates_to_strong_model(calls):
+    canned, models = calls
+    canned[FAST_MODEL] = extraction([task(confidence=0.1)])
+    canned[STRONG_MODEL] = extraction([task('Strong task')])
+
+    results = extract_with_cascade(SHORT)
+    assert models == [FAST_MODEL, STRONG_MODEL]
+    assert [t['title'] for t in results['tasks']] == ['Strong task']
+    assert results['routing']['outcome'] == 'escalated'
+    assert results['routing']['escalation_reason'] == 'low_confidence'
+    assert results['routing']['final_model'] == STRONG_MODEL
+
+
+def test_extract_with_cascade_keeps_fast_result_when_strong_model_fails(calls):
+    canned, models = calls
+    canned[FAST_MODEL] = extraction([task('Fast task', confidence=0.1)])
+    canned[STRONG_MODEL] = extraction([], extraction_error='quota exceeded')
+
+    results = extract_with_cascade(SHORT)
+    assert models == [FAST_MODEL, STRONG_MODEL]
+    assert [t['title'] for t in results['tasks']] == ['Fast task']
+    assert 'extraction_error' not in results
+    assert results['routing']['outcome'] == 'strong_failed'
+    assert results['routing']['final_model'] == FAST_MODEL
+
+
+def test_extract_with_cascade_skips_assessment_for_strong_first(calls):
+    canned, models = calls
+    canned[STRONG_MODEL] = extraction([task(confidence=0.1)])
+
+    routing = extract_with_cascade('word ' * (router.SHORT_TRANSCRIPT_WORDS + 1))['routing']
+    assert models == [STRONG_MODEL]
+    assert routing['outcome'] == 'accepted' and 'quality' not in routing
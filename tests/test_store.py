@@ -0,0 +1,140 @@
+# tests/test_store.py
+from datetime import date
+
+import pytest
+
+from src.store import TaskStore, parse_deadline_date
+
+# Wednesday
+MEETING_DATE = date(2025, 11, 12)
+
+
+def make_task(title, owner='Mira', priority='Medium', deadline='TBD'):
+    return {"title": title, "description": title, "owner": owner, "priority": priority, "deadline": deadline}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TaskStore(str(tmp_path / 'tasks.db'))
+    store.save_analysis('meeting-a', [
+        make_task('Update roadmap', owner='Mira', priority='High', deadline='next Friday'),
+        make_task('Send survey', owner='Leah', deadline='tomorrow'),
+        make_task('Book venue', owner='mira ', priority='low', deadline='TBD'),
+    ], meeting_summary='Planning', meeting_date=MEETING_DATE.isoformat())
+    store.save_analysis('meeting-b', [
+        make_task('Review budget', owner='Raj', deadline='2025-12-01'),
+        make_task('Fix login bug', owner='Mira', priority='High', deadline='EOD'),
+    ], meeting_summary='Triage', meeting_date=MEETING_DATE.isoformat())
+    return store
+
+
+@pytest.mark.parametrize('deadline, expected', [
+    ('2025-12-01', '2025-12-01'),
+    ('tomorrow morning', '2025-11-13'),
+    ('Tonight by 8 PM', '2025-11-12'),
+    ('by Friday', '2025-11-14'),
+    ('By Wednesday', '2025-11-19'),
+    ('next Tuesday at 3 PM', '2025-11-18'),
+    ('EOD this week', '2025-11-14'),
+    ('next week', '2025-11-21'),
+    ('in two weeks', '2025-11-26'),
+    ('end of month', '2025-11-30'),
+    ('by November 20th', '2025-11-20'),
+    ('Jan 5', '2026-01-05'),
+    ('Thursday or Friday', '2025-11-13'),
+    ('TBD', None),
+    ('Ongoing', None),
+])
+def test_parse_deadline_date_resolves_relative_deadlines(deadline, expected):
+    assert parse_deadline_date(deadline, MEETING_DATE) == expected
+
+
+def test_parse_deadline_date_without_reference_only_accepts_iso():
+    assert parse_deadline_date('2025-12-01') == '2025-12-01'
+    assert parse_deadline_date('next Friday') is None
+    assert parse_deadline_date('2025-13-40') is None
+
+
+def test_save_analysis_is_idempotent(store):
+    assert store.save_analysis('meeting-a', [make_task('Something else')]) is False
+    stored = store.get_analysis('meeting-a')
+    assert [task['title'] for task in stored['tasks']] == ['Update roadmap', 'Send survey', 'Book venue']
+    assert stored['meeting_date'] == '2025-11-12'
+
+
+def test_save_analysis_replace_keeps_ids_and_statuses_of_matching_tasks(store):
+    old = {task['title']: task for task in store.get_analysis('meeting-a')['tasks']}
+    store.update_task_status(old['Send survey']['task_id'], 'done')
+    store.update_task_status(old['Book venue']['task_id'], 'cancelled')
+
+    assert store.save_analysis('meeting-a', [
+        make_task('send  Survey', owner='Leah'),
+        make_task('Update roadmap', owner='Mira'),
+        make_task('Draft agenda'),
+    ], meeting_date=MEETING_DATE.isoformat(), replace=True) is True
+
+    new = {task['title']: task for task in store.get_analysis('meeting-a')['tasks']}
+    assert new['send  Survey']['task_id'] == old['Send survey']['task_id']
+    assert new['send  Survey']['status'] == 'done'
+    assert new['Update roadmap']['task_id'] == old['Update roadmap']['task_id']
+    assert new['Update roadmap']['status'] == 'open'
+    assert new['Draft agenda']['task_id'] not in [task['task_id'] for task in old.values()]
+    assert store.query_tasks(status='cancelled')[0] == []
+
+
+def test_query_tasks_filters(store):
+    tasks, _ = store.query_tasks(owner='MIRA')
+    assert [task['title'] for task in tasks] == ['Update roadmap', 'Book venue', 'Fix login bug']
+
+    tasks, _ = store.query_tasks(owner='mira', priority='high')
+    assert [task['title'] for task in tasks] == ['Update roadmap', 'Fix login bug']
+
+    tasks, _ = store.query_tasks(meeting_id='meeting-b')
+    assert [task['title'] for task in tasks] == ['Review budget', 'Fix login bug']
+
+    tasks, _ = store.query_tasks(deadline='tbd')
+    assert [task['title'] for task in tasks] == ['Book venue']
+
+
+def test_query_tasks_due_date_range_uses_resolved_deadlines(store):
+    tasks, _ = store.query_tasks(due_before='2025-11-14')
+    assert [task['title'] for task in tasks] == ['Send survey', 'Fix login bug']
+
+    tasks, _ = store.query_tasks(due_after='2025-11-15', due_before='2025-11-30')
+    assert [task['title'] for task in tasks] == ['Update roadmap']
+
+
+def test_query_tasks_status_filter(store):
+    task_id = store.query_tasks(owner='Leah')[0][0]['task_id']
+    assert store.update_task_status(task_id, 'done') is True
+
+    done, _ = store.query_tasks(status='done')
+    assert [task['task_id'] for task in done] == [task_id]
+    open_tasks, _ = store.query_tasks(status='open')
+    assert task_id not in [task['task_id'] for task in open_tasks]
+
+    with pytest.raises(ValueError):
+        store.update_task_status(task_id, 'finished')
+    assert store.update_task_status(9999, 'done') is False
+
+
+def test_query_tasks_keyset_pagination(store):
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        tasks, cursor = store.query_tasks(limit=2, after=cursor)
+        seen.extend(task['task_id'] for task in tasks)
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == sorted(seen) and len(seen) == len(set(seen)) == 5
+
+
+def test_query_tasks_exact_page_has_no_next_cursor(store):
+    tasks, cursor = store.query_tasks(limit=5)
+    assert len(tasks) == 5 and cursor is None
+
+    tasks, cursor = store.query_tasks(limit=0)
+    assert len(tasks) == 1 and cursor == tasks[0]['task_id']